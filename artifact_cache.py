@@ -0,0 +1,142 @@
+# 🗄️ ARTIFACT CACHE — เก็บไฟล์ที่สร้างแล้วลงดิสก์ตาม fingerprint ของ selection (content-addressed)
+# selection เดียวกัน (business type, คำถาม+จำนวน, สินค้า, รายละเอียด, custom, เวอร์ชันคลัง) ได้ไฟล์เดิมทันที
+# และยังอยู่หลัง restart แอป; เกินเพดานขนาด/จำนวนไฟล์จะลบไฟล์ที่ใช้ล่าสุดนานที่สุดก่อน (LRU ตาม mtime)
+import os
+import tempfile
+import threading
+
+CACHE_DIR = os.environ.get(
+    "SURVEY_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".artifact_cache")
+)
+CACHE_MAX_BYTES = int(os.environ.get("SURVEY_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+CACHE_MAX_ENTRIES = int(os.environ.get("SURVEY_CACHE_MAX_ENTRIES", 2000))
+EVICT_LOW_WATER = 0.9  # เกินเพดานแล้วลบลงเหลือสัดส่วนนี้ของเพดาน — put ถัดๆ ไปไม่ต้องสแกนโฟลเดอร์ทุกครั้ง
+
+
+class ArtifactCache:
+    """
+    ไฟล์ละหนึ่ง artifact: <root>/<fp[:2]>/<fp>.<kind>
+    เขียนผ่านไฟล์ชั่วคราวแล้ว os.replace (ไม่มีไฟล์ครึ่งๆ กลางๆ แม้หลาย process เขียนพร้อมกัน)
+    อ่านเจอแล้วแตะ mtime เพื่อให้ LRU รู้ว่าเพิ่งถูกใช้
+    ขนาด/จำนวนไฟล์นับต่อจากการสแกนครั้งล่าสุด — สแกนทั้งโฟลเดอร์ (evict) เฉพาะตอนตัวนับเกินเพดาน
+    (ไฟล์ที่ process อื่นเขียนจะถูกนับเมื่อสแกนรอบถัดไป)
+    """
+
+    def __init__(self, root: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES,
+                 max_entries: int = CACHE_MAX_ENTRIES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._bytes = None  # ขนาดรวม/จำนวนไฟล์ที่รู้ (None = ยังไม่เคยสแกน)
+        self._count = None
+
+    def path(self, fingerprint: str, kind: str) -> str:
+        return os.path.join(self.root, fingerprint[:2], f"{fingerprint}.{kind}")
+
+    def get(self, fingerprint: str, kind: str) -> bytes | None:
+        path = self.path(fingerprint, kind)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            return None
+        return data
+
+    def contains(self, fingerprint: str, kind: str) -> bool:
+        """มีไฟล์ใน cache ไหม (ไม่อ่านเนื้อไฟล์; แตะ mtime เหมือน get)"""
+        try:
+            os.utime(self.path(fingerprint, kind))
+        except OSError:
+            return False
+        return True
+
+    def put(self, fingerprint: str, kind: str, data: bytes) -> bool:
+        """เขียนลง cache -> True ถ้าเขียนได้ (ใหญ่เกินเพดานหรือดิสก์มีปัญหา = False)"""
+        if len(data) > self.max_bytes:
+            return False
+        path = self.path(fingerprint, kind)
+        tmp = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            try:
+                replaced = os.stat(path).st_size
+            except OSError:
+                replaced = None
+            os.replace(tmp, path)
+        except OSError:
+            # cache เขียนไม่ได้ (ดิสก์เต็ม / read-only) ก็แค่ไม่ได้ cache — ไม่ทิ้ง .tmp ไว้ (evict ไม่นับ .tmp)
+            if tmp is not None:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+            return False
+        with self._lock:
+            if self._bytes is not None:
+                self._bytes += len(data) - (replaced or 0)
+                self._count += replaced is None
+            over = self._bytes is None or self._bytes > self.max_bytes or self._count > self.max_entries
+        if over:
+            self.evict()
+        return True
+
+    def get_or_build(self, fingerprint: str, kind: str, build) -> bytes:
+        data = self.get(fingerprint, kind)
+        if data is None:
+            data = build()
+            self.put(fingerprint, kind, data)
+        return data
+
+    def _entries(self):
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def evict(self) -> int:
+        """เกินเพดานขนาดรวมหรือจำนวนไฟล์ -> ลบไฟล์เก่าสุดจนเหลือ EVICT_LOW_WATER ของเพดาน; คืนจำนวนไฟล์ที่ลบ"""
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            if total > self.max_bytes or len(entries) > self.max_entries:
+                max_bytes, max_entries = self.max_bytes * EVICT_LOW_WATER, int(self.max_entries * EVICT_LOW_WATER)
+            else:
+                max_bytes, max_entries = self.max_bytes, self.max_entries
+            for _, size, path in entries:
+                if total <= max_bytes and len(entries) - removed <= max_entries:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+            self._bytes, self._count = total, len(entries) - removed
+            return removed
+
+    def clear(self) -> None:
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        with self._lock:
+            self._bytes = self._count = None
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        return {"entries": len(entries), "bytes": sum(size for _, size, _ in entries)}
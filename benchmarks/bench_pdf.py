@@ -0,0 +1,44 @@
+# ⏱️ BENCHMARK — PDF renderer ที่ 1k / 10k / 50k แถว
+#   python benchmarks/bench_pdf.py [--rows 1000,10000,50000] [--workers 4] [--memory]
+# (--memory วัด peak ด้วย tracemalloc ในรอบแยก เพราะ tracemalloc ทำให้เวลาช้าลงหลายเท่า)
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from survey_pdf import register_font, render_pdf  # noqa: E402
+
+
+def synthetic_rows(n: int):
+    products = ["ก่อ-Grey", "ฉาบ-Mortar-LW", "ปูกระเบื้อง-Mortar-TA", "เทโครงสร้าง-RMC", "สี-สีจริง"]
+    details = ["ยี่ห้อ", "ราคาหน้าร้าน", "ราคาทุน", "สต็อก", "ปัจจัยเลือกแบรนด์ และเหตุผลที่เลือกซื้อจากร้านประจำในพื้นที่"]
+    return [["Product & Details", f"{products[i % 5]}-{details[(i // 5) % 5]}#{i // 25 + 1}", ""] for i in range(n)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", default="1000,10000,50000")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--memory", action="store_true")
+    args = parser.parse_args(argv)
+
+    register_font()  # ไม่นับเวลาโหลดฟอนต์ครั้งแรก
+    for n in (int(x) for x in args.rows.split(",")):
+        rows = synthetic_rows(n)
+        started = time.perf_counter()
+        data = render_pdf(rows, workers=args.workers)
+        elapsed = time.perf_counter() - started
+        line = f"{n:>7,} rows  workers={args.workers}  {elapsed:7.2f}s  {len(data) / 1e6:6.1f} MB pdf"
+        if args.memory:
+            tracemalloc.start()
+            render_pdf(rows, workers=args.workers)
+            line += f"  peak {tracemalloc.get_traced_memory()[1] / 1e6:7.1f} MB"
+            tracemalloc.stop()
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+# ⏱️ BENCHMARK — selection -> artifact ทั้งสาย บนคลังคำถามสังเคราะห์หลายขนาด (เวลา + peak memory ต่อขั้น)
+#   python benchmarks/bench_pipeline.py [--scales small,medium,large] [--repeat 3] [-o bench_pipeline.json]
+#   python benchmarks/bench_pipeline.py --compare old.json            # เทียบกับผลของเวอร์ชันก่อน (ratio > 1 = ช้าลง)
+# เวลา = ค่าน้อยสุดจาก --repeat รอบ; peak memory วัดด้วย tracemalloc ในรอบแยก (tracemalloc ทำให้เวลาช้าลงหลายเท่า)
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from qgroup_matcher import NO_GROUP, QGroupMatcher  # noqa: E402
+from question_bank import build_sheets_data_from_bank  # noqa: E402
+from survey_engine import (  # noqa: E402
+    BUILDERS, brand_validations, build_column_plan, build_pdf, write_dict_sheet,
+)
+from survey_pdf import register_font  # noqa: E402
+
+# ขนาด: คำถามในคลัง, สินค้าใน Product List, จำนวนต่อสินค้า, detail, คำถามที่เพิ่มเอง
+SCALES = {
+    "small": {"questions": 60, "products": 10, "qty": 2, "details": 5, "custom": 5},
+    "medium": {"questions": 300, "products": 40, "qty": 5, "details": 8, "custom": 30},
+    "large": {"questions": 1500, "products": 100, "qty": 10, "details": 12, "custom": 150},
+}
+SHEETS = ("Respondent Profile", "Customer & Market", "Business & Strategy", "Pain Points & Needs", "Product & Process")
+SYLLABLES = ("ลูก", "ค้า", "ร้าน", "ซื้อ", "ขาย", "ราคา", "สินค้า", "ปูน", "ส่ง", "ของ", "งาน", "ช่าง", "เดือน", "ต่อ",
+             "ครั้ง", "ที่", "ไหน", "อย่างไร", "เท่าไหร่", "หลัก", "ใหม่", "ประจำ", "พื้นที่", "โครงการ")
+PRODUCT_STEMS = ("ก่อ-Grey", "ฉาบ-Mortar-LW", "ปูกระเบื้อง-Mortar-TA", "ยาแนว-Mortar-TG", "สกิม-Skim",
+                 "เทโครงสร้าง-RMC", "สี-สีจริง", "ปูนผง-Cement")
+DETAILS = ("ยี่ห้อ", "ราคาหน้าร้าน", "ราคาทุน", "สต็อก", "ยี่ห้อ/รุ่น", "ปริมาณการซื้อต่อครั้ง", "แบรนด์",
+           "ปัจจัยเลือกแบรนด์", "เหตุผลที่เลือกซื้อ", "ร้านที่ซื้อประจำ", "ความถี่ในการซื้อ", "รุ่น")
+
+
+def synthetic_text(rng: random.Random, words: int) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(words))
+
+
+def synthetic_bank(scale: dict, seed: int = 0) -> dict:
+    """bank_for_biz (sheet -> rows) แบบเดียวกับ QUESTION_BANK[biz] — คำถามกระจายทุกชีต ไม่ซ้ำกัน"""
+    rng = random.Random(seed)
+    bank, seen = {sheet: [] for sheet in SHEETS}, set()
+    while len(seen) < scale["questions"]:
+        question = synthetic_text(rng, rng.randint(3, 9))
+        if question not in seen:
+            seen.add(question)
+            sheet = SHEETS[len(seen) % len(SHEETS)]
+            bank[sheet].append({"standard_question_th": question, "q_group": sheet})
+    bank["Product List"] = [{"standard_question_th": f"{PRODUCT_STEMS[i % len(PRODUCT_STEMS)]} {i // len(PRODUCT_STEMS) + 1}"}
+                            for i in range(scale["products"])]
+    bank["Product & Details"] = [{"standard_question_th": DETAILS[i % len(DETAILS)] + ("" if i < len(DETAILS) else f" {i}")}
+                                 for i in range(scale["details"])]
+    return bank
+
+
+def synthetic_selection(sheets_data: dict, scale: dict, seed: int = 0):
+    """
+    selection แบบที่หน้า UI ส่งมา: คำถามทุกข้อในคลัง (บางข้อหลายครั้ง) + คำถามที่เพิ่มเอง (ไม่มี Group ต้องหาให้)
+    ครึ่งหนึ่งของคำถามที่เพิ่มเองดัดแปลงจากคำถามในคลัง (ควรหา group เจอ) อีกครึ่งเป็นคำใหม่
+    """
+    rng = random.Random(seed + 1)
+    questions = []
+    for sheet in SHEETS:
+        for question in sheets_data[sheet]["standard_question_th"]:
+            questions.append({"Group": sheet, "Question": question, "Quantity": rng.choice((1, 1, 1, 2, 3))})
+    bank_questions = [q["Question"] for q in questions]
+    custom = [rng.choice(bank_questions) + synthetic_text(rng, 1) if i % 2 == 0 else synthetic_text(rng, 6)
+              for i in range(scale["custom"])]
+    products = [{"name": name, "qty": scale["qty"]} for name in sheets_data["Product List"]["standard_question_th"]]
+    details = list(sheets_data["Product & Details"]["standard_question_th"])
+    return questions, custom, products, details
+
+
+def dict_validation(plan):
+    """ชีต Dict + named range + DV ยี่ห้อต่อหมวด (ส่วนที่ build_template_excel ทำนอกจากหัวคอลัมน์) เขียนเป็นไฟล์จริง"""
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Survey Template")
+    for dv in brand_validations(plan, write_dict_sheet(wb)):
+        ws.data_validations.append(dv)
+    wb.save(BytesIO())
+
+
+def index_recall(sheets_data, queries) -> dict:
+    """NgramIndex (บังคับเปิด) เทียบกับไล่ทุกแถว: group ที่ต่าง และจำนวนที่ match/N/A พลิก"""
+    indexed = QGroupMatcher.from_sheets_data(sheets_data, use_index=True).match_many(queries)
+    full = QGroupMatcher.from_sheets_data(sheets_data, use_index=False).match_many(queries)
+    return {
+        "queries": len(queries),
+        "group_diff": sum(a != b for a, b in zip(indexed, full)),
+        "flips": sum((a == NO_GROUP) != (b == NO_GROUP) for a, b in zip(indexed, full)),
+    }
+
+
+def measure(fn, repeat: int, memory: bool):
+    """(ผลลัพธ์, เวลาน้อยสุด, peak MB หรือ None)"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    return result, best, peak
+
+
+def run_scale(name: str, scale: dict, repeat: int, memory: bool, seed: int = 0) -> dict:
+    stages = {}
+
+    def stage(key, fn):
+        result, seconds, peak = measure(fn, repeat, memory)
+        stages[key] = {"seconds": round(seconds, 6), "peak_mb": None if peak is None else round(peak, 3)}
+        print(f"  {key:<24} {seconds * 1000:10.1f} ms" + ("" if peak is None else f"  peak {peak:8.1f} MB"))
+        return result
+
+    print(f"▶️ {name}: {scale}")
+    bank = synthetic_bank(scale, seed)
+    sheets_data = stage("build_sheets_data", lambda: build_sheets_data_from_bank(bank))
+    questions, custom, products, details = synthetic_selection(sheets_data, scale, seed)
+    matcher = stage("matcher_build", lambda: QGroupMatcher.from_sheets_data(sheets_data))
+    groups = stage("find_q_group", lambda: matcher.match_many(custom))
+    recall = index_recall(sheets_data, custom)
+    print(f"  {'index_recall':<24} {recall['queries'] - recall['group_diff']}/{recall['queries']} same group, "
+          f"{recall['flips']} match/N/A flips")
+    questions = questions + [{"Group": group, "Question": question, "Quantity": 1}
+                             for question, group in zip(custom, groups)]
+    # group ถูกหาไว้แล้ว (NO_GROUP = หาไม่เจอ) — ขั้นนี้จึงวัดแค่การเรียงกลุ่ม + generate_unique_label + หมวด dropdown
+    plan = stage("column_plan", lambda: build_column_plan(questions, products, details))
+    stage("dict_validation", lambda: dict_validation(plan))
+    for kind in ("excel", "vertical", "google_sheets", "long"):
+        stage(f"writer_{kind}", lambda kind=kind: BUILDERS[kind](plan))
+    stage("pdf", lambda: build_pdf(plan))
+    return {
+        "scale": name, "params": scale, "columns": len(plan),
+        "custom_matched": sum(group != NO_GROUP for group in groups), "index_recall": recall, "stages": stages,
+    }
+
+
+def git_revision():
+    try:
+        proc = subprocess.run(["git", "describe", "--always", "--dirty"], cwd=ROOT, capture_output=True, text=True)
+    except OSError:
+        return None
+    return proc.stdout.strip() or None
+
+
+def compare(current: dict, baseline: dict):
+    """พิมพ์ ratio เวลา (ปัจจุบัน / baseline) ต่อขั้น ของ scale ที่มีทั้งสองชุด"""
+    old = {r["scale"]: r for r in baseline["results"]}
+    print(f"📊 vs {baseline.get('revision') or '?'} ({baseline.get('created', '?')})")
+    for result in current["results"]:
+        if result["scale"] not in old:
+            continue
+        print(f"  {result['scale']}")
+        for key, now in result["stages"].items():
+            before = old[result["scale"]]["stages"].get(key)
+            if before and before["seconds"]:
+                ratio = now["seconds"] / before["seconds"]
+                flag = "  ⚠️" if ratio > 1.2 else ""
+                print(f"    {key:<24} {before['seconds'] * 1000:10.1f} -> {now['seconds'] * 1000:10.1f} ms  x{ratio:5.2f}{flag}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="benchmark selection -> artifact บนคลังคำถามสังเคราะห์")
+    parser.add_argument("--scales", default="small,medium,large", help=f"คั่นด้วย comma ({', '.join(SCALES)})")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="ไม่วัด peak memory (เร็วขึ้น)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--out", default="bench_pipeline.json", help="ไฟล์ผลลัพธ์ JSON")
+    parser.add_argument("--compare", default=None, help="JSON ของรอบก่อน (เช่น จากเวอร์ชันเก่า) ไว้เทียบ")
+    args = parser.parse_args(argv)
+
+    names = [s.strip() for s in args.scales.split(",") if s.strip()]
+    unknown = set(names) - set(SCALES)
+    if unknown:
+        parser.error(f"unknown scale(s): {', '.join(sorted(unknown))}")
+
+    # ไม่นับ import / โหลดฟอนต์ครั้งแรก (จ่ายครั้งเดียวต่อ process) ในขั้นแรกที่ใช้
+    import openpyxl  # noqa: F401
+    import rapidfuzz.process  # noqa: F401
+    import reportlab.pdfgen.canvas  # noqa: F401
+    register_font()
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "results": [run_scale(name, SCALES[name], args.repeat, not args.no_memory, args.seed) for name in names],
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"🏁 {len(names)} scale(s) -> {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
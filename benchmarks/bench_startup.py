@@ -0,0 +1,89 @@
+# ⏱️ BENCHMARK — cold start ของหน้า UI: เวลา import โมดูลของแอป + เวลารันสคริปต์รอบแรก (หน้าเลือก business type)
+#   python benchmarks/bench_startup.py [--repeat 5]
+# แต่ละรอบรันใน process ใหม่ (python -X importtime) — streamlit / pandas import ไว้ก่อนแล้วไม่นับ เพราะแอปไหนก็ต้องจ่าย
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def app_modules(script: str = "stline.py") -> tuple:
+    """โมดูลของแอป (ไฟล์ .py ใน ROOT) ที่ script import ระดับบนสุด — ตามโค้ดจริง ไม่ต้องแก้ list เองเมื่อเพิ่มโมดูล"""
+    with open(os.path.join(ROOT, script), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.append(node.module)
+    return tuple(sorted({n for n in names if os.path.isfile(os.path.join(ROOT, n.split(".")[0] + ".py"))}))
+
+
+APP_MODULES = app_modules()  # ที่ stline.py import ตอนเริ่ม
+HEAVY_PACKAGES = ("openpyxl", "reportlab", "rapidfuzz", "googleapiclient", "pypdf")  # ควรโหลดตอน export เท่านั้น
+
+_IMPORT_APP = "import streamlit, pandas; import " + ", ".join(APP_MODULES)
+_FIRST_PAINT = (
+    "import time; from streamlit.testing.v1 import AppTest; "
+    "at = AppTest.from_file({script!r}, default_timeout=120); "
+    "t = time.perf_counter(); at.run(); print(time.perf_counter() - t)"
+)
+
+
+def import_profile():
+    """
+    import โมดูลของแอปใน process ใหม่ -> (เวลารวม, {package: เวลา}) ของสิ่งที่ถูกโหลดหลัง streamlit/pandas (วินาที)
+    เวลารวม = ผลรวมของบรรทัดระดับบนสุด; เวลาต่อ package = ผลรวม self time ของทุก submodule
+    """
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", _IMPORT_APP],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    total, packages, started = 0.0, {}, False
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        self_us, cum, raw_name = line[len("import time:"):].split("|")
+        if not cum.strip().isdigit():
+            continue
+        name = raw_name.strip()
+        if started:
+            package = name.split(".")[0]
+            packages[package] = packages.get(package, 0.0) + int(self_us) / 1e6
+            if raw_name[1:2] != " ":  # ระดับบนสุด (ไม่มีการย่อหน้า)
+                total += int(cum) / 1e6
+        elif name == "pandas" and raw_name[1:2] != " ":
+            started = True  # ทุกอย่างหลังบรรทัดนี้ถูก import โดยโมดูลของแอป
+    return total, packages
+
+
+def first_paint() -> float:
+    """เวลารัน stline.py รอบแรก (ยังไม่เลือก business type) ใน process ใหม่"""
+    code = _FIRST_PAINT.format(script=os.path.join(ROOT, "stline.py"))
+    proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return float(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    runs = [import_profile() for _ in range(args.repeat)]
+    app = [total for total, _ in runs]
+    packages = [p for _, p in runs]
+    print(f"import {', '.join(APP_MODULES)}: median {statistics.median(app) * 1000:7.1f} ms")
+    for package in HEAVY_PACKAGES:
+        loaded = [p[package] for p in packages if package in p]
+        state = f"loaded, {statistics.median(loaded) * 1000:.1f} ms" if loaded else "not loaded"
+        print(f"  {package:<16} {state}")
+
+    paints = [first_paint() for _ in range(args.repeat)]
+    print(f"first run of stline.py: median {statistics.median(paints) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
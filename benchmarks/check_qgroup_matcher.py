@@ -0,0 +1,141 @@
+# 🧪 CHECK — QGroupMatcher ต้องให้ group เดียวกับ find_q_group เดิม (ไล่ iterrows ทีละแถว) ทุกคำถาม
+#   python benchmarks/check_qgroup_matcher.py [--cases 40] [--queries 300] [--seed 0]
+# เน้นเคสที่คะแนนปัดเศษแล้วเปลี่ยนผล: สองแถวคะแนนต่างกันไม่ถึง 1 (แถวคะแนนต่ำอยู่ก่อน)
+# และคะแนนต่ำกว่า threshold ไม่ถึง 1 (79.5-79.99 ต้องเป็น N/A) + คำถามดัดแปลงจากคลังจริงทุก business type
+import argparse
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qgroup_matcher import FUZZY_MATCH_THRESHOLD, QGroupMatcher, clean_question  # noqa: E402
+from question_bank import BUSINESS_TYPES, get_sheets_data  # noqa: E402
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+# เคสจาก review: LOW = 80.952, HIGH = 81.081 — ปัดเป็น 81 ทั้งคู่แล้วแถวแรก (LOW) ชนะ
+KNOWN_NEAR_TIE = ("abcdefghijklmnopqrstu", [("LOW", "abcdyfghigkqlynoqrstu"), ("HIGH", "agdmfgijoklmnopqrtu")])
+
+
+def original_find_q_group(base_question, sheets_data):
+    """find_q_group ก่อนมี QGroupMatcher (ตัดมาจาก stline.py เดิม) — ใช้เป็นคำตอบอ้างอิง"""
+    from rapidfuzz import fuzz
+    base = clean_question(base_question)
+    best_score, best_group = 0, "N/A"
+    for df in sheets_data.values():
+        if "standard_question_th" in df.columns and "q_group" in df.columns:
+            df = df.copy()
+            df["standard_clean"] = df["standard_question_th"].astype(str).apply(clean_question)
+            for _, row in df.iterrows():
+                ref_q = row["standard_clean"]
+                score = max(fuzz.partial_ratio(base, ref_q), fuzz.token_sort_ratio(base, ref_q))
+                if score > best_score and score >= FUZZY_MATCH_THRESHOLD:
+                    best_score = score
+                    best_group = str(row["q_group"])
+    return best_group
+
+
+def score(query: str, ref: str) -> float:
+    from rapidfuzz import fuzz
+    return max(fuzz.partial_ratio(query, ref), fuzz.token_sort_ratio(query, ref))
+
+
+def mutate(rng: random.Random, text: str, alphabet: str) -> str:
+    chars = list(text)
+    for _ in range(rng.randint(1, 6)):
+        op, i = rng.random(), rng.randrange(len(chars) + 1)
+        if op < 0.4 and chars:
+            chars[min(i, len(chars) - 1)] = rng.choice(alphabet)
+        elif op < 0.7:
+            chars.insert(i, rng.choice(alphabet))
+        elif chars:
+            del chars[min(i, len(chars) - 1)]
+    return "".join(chars)
+
+
+def below_threshold_ref(rng: random.Random):
+    """
+    (query, ref) ที่คะแนน = 100 * (1 - k/L) อยู่ใน [threshold - 0.5, threshold) พอดี:
+    query ยาว L = 5k - 1 จากตัวอักษร a-w, ref = แทนที่ k ตำแหน่งด้วย x/y/z (ไม่มีใน query จึงไม่ match)
+    """
+    k = rng.randint(9, 13)
+    query = "".join(rng.choice(ALPHABET[:23]) for _ in range(5 * k - 1))
+    ref = list(query)
+    for i in rng.sample(range(len(ref)), k):
+        ref[i] = rng.choice(ALPHABET[23:])
+    return query, "".join(ref)
+
+
+def rounding_cases(rng: random.Random, cases: int, tries: int = 2000):
+    """
+    [(ชื่อเคส, query, sheets_data)] ที่คะแนนปัดเป็นจำนวนเต็มแล้วผลเปลี่ยน:
+      near_tie  — แถว LOW (คะแนนต่ำกว่า) อยู่ก่อนแถว HIGH และปัดแล้วได้เท่ากัน
+      below     — แถวเดียวที่คะแนนอยู่ใน [threshold - 0.5, threshold) ปัดแล้วผ่าน threshold
+    """
+    found = {"near_tie": [KNOWN_NEAR_TIE], "below": []}
+    while len(found["near_tie"]) < cases:
+        query = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(12, 40)))
+        scored = [(score(query, ref), ref) for ref in {mutate(rng, query, ALPHABET) for _ in range(tries)}]
+        near = sorted((s, r) for s, r in scored if FUZZY_MATCH_THRESHOLD <= s < 100 and s != round(s))
+        for (s, ref), (s2, ref2) in zip(near, near[1:]):
+            if s < s2 and round(s) == round(s2):
+                found["near_tie"].append((query, [("LOW", ref), ("HIGH", ref2)]))
+                break
+    while len(found["below"]) < cases:
+        query, ref = below_threshold_ref(rng)
+        if FUZZY_MATCH_THRESHOLD - 0.5 <= score(query, ref) < FUZZY_MATCH_THRESHOLD:
+            found["below"].append((query, [("LOW", ref)]))
+    return [(name, query, {"Bank": pd.DataFrame({"standard_question_th": [r for _, r in rows],
+                                                  "q_group": [g for g, _ in rows]})})
+            for name, items in found.items() for query, rows in items]
+
+
+def bank_queries(rng: random.Random, queries: int):
+    """[(business type, query, sheets_data)] — คำถามในคลังจริงที่ถูกดัดแปลงเล็กน้อย (หลายข้อคะแนนใกล้กัน)"""
+    result = []
+    for i in range(queries):
+        biz = BUSINESS_TYPES[i % len(BUSINESS_TYPES)]
+        sheets_data = get_sheets_data(biz)
+        bank = [str(q) for df in sheets_data.values() if "q_group" in df.columns for q in df["standard_question_th"]]
+        text = rng.choice(bank)
+        result.append((biz, mutate(rng, text, text), sheets_data))
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="QGroupMatcher เทียบกับ find_q_group เดิม (iterrows)")
+    parser.add_argument("--cases", type=int, default=40, help="จำนวนเคสต่อชนิด (near_tie, below)")
+    parser.add_argument("--queries", type=int, default=300, help="จำนวนคำถามดัดแปลงจากคลังจริง")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    checks = rounding_cases(rng, args.cases) + bank_queries(rng, args.queries)
+    # คำถามของ business type เดียวกันให้คะแนนใน batch เดียว (match_many) เหมือนตอน export
+    batches = {}
+    for i, (name, query, sheets_data) in enumerate(checks):
+        batches.setdefault(id(sheets_data), (sheets_data, []))[1].append(i)
+    got_all = [None] * len(checks)
+    for sheets_data, indices in batches.values():
+        matched = QGroupMatcher.from_sheets_data(sheets_data).match_many([checks[i][1] for i in indices])
+        for i, group in zip(indices, matched):
+            got_all[i] = group
+
+    failed = 0
+    for (name, query, sheets_data), got in zip(checks, got_all):
+        want = original_find_q_group(query, sheets_data)
+        if got != want:
+            failed += 1
+            if failed <= 5:
+                print(f"❌ {name}: {query!r} -> {got!r}, find_q_group เดิม -> {want!r}")
+    print(f"🏁 {'FAILED' if failed else 'OK'}: {len(checks) - failed}/{len(checks)} same group "
+          f"in {time.perf_counter() - started:.1f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+# 🧪 STRESS — export พร้อมกันหลายงาน (thread + process) ต้องได้ column plan เหมือนรันทีละงานทุกประการ
+#   python benchmarks/stress_labels.py [--exports 200] [--threads 16] [--workers 4] [--seed 0]
+# selection สุ่มจากคลังจริงทุก business type และจงใจให้ชื่อคอลัมน์ชนกัน (คำถามซ้ำ, คำถามที่เพิ่มเองเป็น "x#2", สินค้าซ้ำ)
+# เพื่อให้ LabelAllocator ต้องต่อท้าย #n — ถ้ามี state ที่แชร์ข้ามงาน ลำดับ #n จะเพี้ยนเมื่อรันพร้อมกัน
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_bank import BUSINESS_TYPES, get_sheets_data  # noqa: E402
+from survey_engine import build_column_plan  # noqa: E402
+
+
+def random_selection(rng: random.Random) -> dict:
+    biz = rng.choice(BUSINESS_TYPES)
+    sheets_data = get_sheets_data(biz)
+    bank = [(q, g) for name, df in sheets_data.items() if name not in ("Product List", "Product & Details")
+            for q, g in zip(df["standard_question_th"], df["q_group"])]
+    questions = []
+    for question, group in rng.sample(bank, min(len(bank), rng.randint(5, 40))):
+        questions.append({"Group": group if rng.random() < 0.7 else None, "Question": question,
+                          "Quantity": rng.choice((1, 1, 2, 3))})
+    for _ in range(rng.randint(0, 8)):  # คำถามที่เพิ่มเอง: ซ้ำกับในคลัง หรือหน้าตาเหมือน label ที่ต่อท้ายแล้ว
+        question, _group = rng.choice(bank)
+        custom = rng.choice((question, f"{question}#{rng.randint(1, 3)}", f"{question}#1#2"))
+        questions.append({"Group": None, "Question": custom, "Quantity": rng.choice((1, 2))})
+
+    products, details = [], []
+    if "Product List" in sheets_data and "Product & Details" in sheets_data:
+        names = list(sheets_data["Product List"]["standard_question_th"])
+        products = [{"name": rng.choice(names), "qty": rng.randint(1, 4)} for _ in range(rng.randint(0, 12))]
+        all_details = list(sheets_data["Product & Details"]["standard_question_th"])
+        details = rng.sample(all_details, rng.randint(1, len(all_details)))
+    return {"biz": biz, "questions": questions, "products": products, "details": details}
+
+
+def plan_signature(selection: dict) -> tuple:
+    """export หนึ่งงาน -> ทุกอย่างที่ writer ใช้จาก plan (เทียบกันได้และส่งข้าม process ได้)"""
+    plan = build_column_plan(selection["questions"], selection["products"], selection["details"],
+                             biz=selection["biz"])
+    return (tuple(plan.labels), tuple(plan.groups()), tuple(plan.base_names[c] for c in plan.base_codes.tolist()),
+            tuple(plan.instances.tolist()), tuple(plan.categories.tolist()), plan.collisions)
+
+
+def check(name: str, results, expected) -> int:
+    mismatched = [i for i, (got, want) in enumerate(zip(results, expected)) if got != want]
+    if mismatched:
+        print(f"❌ {name}: {len(mismatched)}/{len(expected)} plans differ from the serial run (first: #{mismatched[0]})")
+    else:
+        print(f"✅ {name}: {len(expected)} plans identical to the serial run")
+    return len(mismatched)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="export พร้อมกัน (thread/process) ต้องได้ plan เดียวกับรันทีละงาน")
+    parser.add_argument("--exports", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    selections = [random_selection(rng) for _ in range(args.exports)]
+    started = time.perf_counter()
+    expected = [plan_signature(s) for s in selections]
+    collisions = sum(sig[-1] for sig in expected)
+    print(f"▶️ serial: {args.exports} plans, {sum(len(sig[0]) for sig in expected)} columns, "
+          f"{collisions} suffixed labels in {time.perf_counter() - started:.1f}s")
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        failed += check(f"{args.threads} threads", list(pool.map(plan_signature, selections)), expected)
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        failed += check(f"{args.workers} processes", list(pool.map(plan_signature, selections, chunksize=4)), expected)
+
+    print(f"🏁 {'FAILED' if failed else 'OK'} in {time.perf_counter() - started:.1f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+# 🧹 BRAND NORMALIZER — แปลงยี่ห้อที่พิมพ์เอง ("อินทรีดำ", "อินทรีดำ​", "TPI 199") เป็นรายการมาตรฐานใน Dict
+# ให้คะแนน fuzzy เฉพาะค่าที่ไม่ซ้ำและยังไม่เคยเห็น (process.cdist ทีละหมวด) แล้วจำผลไว้ในตาราง memo บนดิสก์
+# รอบถัดไปค่าที่เคยเห็นแล้วไม่ต้องคำนวณใหม่ — คำตอบเป็นล้านเซลล์จึงเหลือการเทียบ fuzzy ไม่กี่พันครั้ง
+#
+# ใช้งาน:
+#   python brand_normalizer.py --store survey_store/ --memo brand_memo.parquet -o normalized.parquet
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import unicodedata
+
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz, process
+
+from qgroup_matcher import strip_invisible
+from question_bank import DICT_DATA
+from survey_ingest import load_answers
+from survey_validate import label_categories
+
+BRAND_MATCH_THRESHOLD = 85
+MEMO_COLUMNS = ["category", "raw", "canonical", "score"]
+SCORER = "mean(WRatio, partial_token_sort_ratio)"  # เปลี่ยนวิธีให้คะแนนแล้ว memo เก่าจะไม่ถูกใช้
+
+
+def normalize_text(text) -> str:
+    """รูปที่ใช้เทียบ: NFKC, ไม่มี zero-width, ตัวเล็ก, ช่องว่าง/ขีดติดกันเหลือช่องว่างเดียว"""
+    text = strip_invisible(unicodedata.normalize("NFKC", str(text))).lower()
+    return " ".join(re.sub(r"[-_/]+", " ", text).split())
+
+
+def dict_version(dict_data=DICT_DATA, threshold: int = BRAND_MATCH_THRESHOLD) -> str:
+    payload = json.dumps([{k: list(v) for k, v in dict_data.items()}, threshold, SCORER],
+                         ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+class BrandNormalizer:
+    """
+    memo: (category, raw) -> (canonical, score) — canonical ว่าง = ไม่ใกล้รายการไหนพอ (ต่ำกว่า threshold)
+    memo_path (.parquet) ถูกโหลดตอนสร้างและเขียนด้วย save(); memo ของ Dict/threshold ชุดอื่นจะถูกทิ้ง
+    """
+
+    def __init__(self, dict_data=DICT_DATA, threshold: int = BRAND_MATCH_THRESHOLD, memo_path: str | None = None):
+        self.threshold = threshold
+        self.memo_path = memo_path
+        self.version = dict_version(dict_data, threshold)
+        self._choices = {}
+        for cat, items in dict_data.items():
+            canonical = [str(item).strip() for item in items]
+            self._choices[cat] = (tuple(canonical), [normalize_text(item) for item in canonical])
+        self.memo = {}
+        self.fuzzy_comparisons = 0
+        self._dirty = False
+        if memo_path and os.path.exists(memo_path):
+            self._load(memo_path)
+
+    def __len__(self):
+        return len(self.memo)
+
+    def _load(self, path: str):
+        table = pd.read_parquet(path)
+        if "version" in table.columns:
+            table = table[table["version"] == self.version]
+        else:
+            table = table.iloc[0:0]
+        for cat, raw, canonical, score in table[MEMO_COLUMNS].itertuples(index=False):
+            self.memo[(cat, raw)] = (canonical, int(score))
+
+    def save(self, path: str | None = None):
+        path = path or self.memo_path
+        if not path or not self._dirty and path == self.memo_path:
+            return
+        rows = [(cat, raw, canonical, score) for (cat, raw), (canonical, score) in self.memo.items()]
+        table = pd.DataFrame(rows, columns=MEMO_COLUMNS).astype({"score": "int16"})
+        table["version"] = self.version
+        tmp = f"{path}.tmp"
+        table.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+        self._dirty = False
+
+    @staticmethod
+    def _scores(queries, choices):
+        """เฉลี่ย WRatio กับ partial_token_sort_ratio: คำย่อ/รุ่น ("tpi 199") ยังเจอ แต่ชื่อเต็มที่ตรงกว่าชนะชื่อที่สั้นกว่า"""
+        weighted = process.cdist(queries, choices, scorer=fuzz.WRatio, dtype=np.float32, workers=-1)
+        partial = process.cdist(queries, choices, scorer=fuzz.partial_token_sort_ratio, dtype=np.float32, workers=-1)
+        return np.rint((weighted + partial) / 2).astype(np.uint8)
+
+    def _resolve(self, cat: str, raws: list):
+        """ค่าใหม่ของหมวดเดียว: ตรงตัว (หลัง normalize) ก่อน ที่เหลือให้คะแนนทั้ง batch ด้วย cdist"""
+        canonical, normalized = self._choices.get(cat, ((), []))
+        exact = {norm: item for item, norm in zip(reversed(canonical), reversed(normalized))}
+        queries, pending = [], []
+        for raw in raws:
+            norm = normalize_text(raw)
+            if norm in exact:
+                self.memo[(cat, raw)] = (exact[norm], 100)
+            elif not norm or not normalized:
+                self.memo[(cat, raw)] = ("", 0)
+            else:
+                queries.append(norm)
+                pending.append(raw)
+        if pending:
+            scores = self._scores(queries, normalized)
+            self.fuzzy_comparisons += scores.size
+            best = scores.argmax(axis=1)
+            for raw, b, score in zip(pending, best, scores[np.arange(len(pending)), best]):
+                self.memo[(cat, raw)] = (canonical[b] if score >= self.threshold else "", int(score))
+        self._dirty = True
+
+    def normalize_many(self, values, categories) -> pd.DataFrame:
+        """
+        คู่ (value, category) -> DataFrame(canonical, score) ตามลำดับเดิม
+        คำนวณเฉพาะคู่ที่ไม่ซ้ำและยังไม่อยู่ใน memo; category ว่าง = ไม่ใช่ช่องยี่ห้อ (canonical = <NA>)
+        """
+        categories = np.asarray(categories, dtype=object)
+        values = np.asarray(values, dtype=object)
+        mask = ~(pd.isna(categories) | pd.isna(values))
+        codes, unique = pd.factorize(pd.MultiIndex.from_arrays([categories[mask], values[mask]]))
+
+        missing = {}
+        for key in unique:
+            if key not in self.memo:
+                missing.setdefault(key[0], []).append(key[1])
+        for cat, raws in missing.items():
+            self._resolve(cat, raws)
+
+        # ผลของคู่ที่ไม่ซ้ำ -> กระจายกลับทุกแถวด้วย take (canonical เป็น categorical: ค่าไม่ซ้ำมีไม่กี่ร้อย)
+        resolved = [self.memo[key] for key in unique]
+        names = sorted({c for c, _ in resolved if c})
+        lookup = {name: i for i, name in enumerate(names)}
+        name_codes = np.asarray([lookup.get(c, -1) for c, _ in resolved], dtype=np.int32)
+        canonical = np.full(len(mask), -1, dtype=np.int32)
+        canonical[mask] = name_codes[codes]
+        score = np.zeros(len(mask), dtype=np.int16)
+        score[mask] = np.asarray([s for _, s in resolved], dtype=np.int16)[codes]
+        return pd.DataFrame({
+            "canonical": pd.Categorical.from_codes(canonical, categories=names),
+            "score": pd.arrays.IntegerArray(score, ~mask),
+        })
+
+
+def normalize_answers(answers: pd.DataFrame, normalizer: BrandNormalizer) -> pd.DataFrame:
+    """เพิ่มคอลัมน์ brand_category / brand (รายการมาตรฐาน) / brand_score ให้คำตอบในช่องยี่ห้อ"""
+    categories = label_categories(answers["label"])
+    is_brand = categories.notna().to_numpy()
+    result = normalizer.normalize_many(answers["value"].to_numpy()[is_brand],
+                                       categories.to_numpy()[is_brand])
+    answers = answers.copy()
+    answers["brand_category"] = categories.to_numpy()
+    brand = pd.Categorical.from_codes(np.full(len(answers), -1, dtype=np.int32),
+                                      categories=result["canonical"].cat.categories)
+    brand[is_brand] = result["canonical"].to_numpy()
+    answers["brand"] = brand
+    score = pd.array(np.zeros(len(answers), dtype=np.int16), dtype="Int16")
+    score[~is_brand] = pd.NA
+    score[is_brand] = result["score"].array
+    answers["brand_score"] = score
+    return answers
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="แปลงยี่ห้อที่พิมพ์เองเป็นรายการมาตรฐานใน Dict")
+    parser.add_argument("-s", "--store", default="survey_store", help="Parquet store จาก survey_ingest.py")
+    parser.add_argument("-m", "--memo", default="brand_memo.parquet", help="ตาราง memo (ใช้ซ้ำข้ามรอบ)")
+    parser.add_argument("-o", "--out", default=None, help="เขียนคำตอบที่มีคอลัมน์ brand เป็น .parquet")
+    parser.add_argument("-t", "--threshold", type=int, default=BRAND_MATCH_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    normalizer = BrandNormalizer(threshold=args.threshold, memo_path=args.memo)
+    known = len(normalizer)
+    answers = normalize_answers(load_answers(args.store), normalizer)
+    normalizer.save()
+    if args.out:
+        answers.to_parquet(args.out, index=False)
+
+    brand = answers[answers["brand_category"].notna()]
+    print(f"🧹 {len(brand)} brand answers, {int(brand['brand'].notna().sum())} mapped to Dict; "
+          f"memo {known} -> {len(normalizer)} entries, {normalizer.fuzzy_comparisons} fuzzy comparisons")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+# 🧵 EXPORT JOBS — สร้างไฟล์ export ใน process pool ที่ใช้ร่วมกันทุก session (ไม่บล็อก thread ของสคริปต์ Streamlit)
+# หนึ่ง job = artifact หลายชนิดของ plan เดียว; หนึ่งชนิดเป็นหนึ่งงานใน pool (progress = จำนวนไฟล์ที่เสร็จ)
+# ผลแต่ละไฟล์ส่งเข้า LazyArtifacts ของ session (และ cache บนดิสก์) ทันทีที่เสร็จ — หน้า UI แค่ poll สถานะ
+#
+# ตั้งค่าผ่าน env:
+#   SURVEY_EXPORT_WORKERS   = จำนวน process (ค่าเริ่มต้น = จำนวน CPU)
+#   SURVEY_EXPORT_MAX_JOBS  = จำนวน job ที่รอ/กำลังทำได้พร้อมกัน เกินแล้ว submit ไม่รับ (QueueFull)
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from survey_engine import BUILDERS, DEFAULT_ARTIFACTS, LazyArtifacts
+
+EXPORT_WORKERS = int(os.environ.get("SURVEY_EXPORT_WORKERS", os.cpu_count() or 1))
+EXPORT_MAX_JOBS = int(os.environ.get("SURVEY_EXPORT_MAX_JOBS", 8))
+JOB_TTL = 3600  # วินาทีที่เก็บ job ที่จบแล้วไว้ให้ถามสถานะ
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+
+class QueueFull(RuntimeError):
+    pass
+
+
+class ExportJob:
+    """สถานะของ job หนึ่งงาน (อ่านจาก thread ของ UI ได้ตลอด; ExportQueue เป็นคนแก้)"""
+
+    def __init__(self, artifacts: LazyArtifacts, kinds):
+        self.job_id = uuid.uuid4().hex[:12]
+        self.artifacts = artifacts
+        self.kinds = tuple(kinds)
+        self.done = []
+        self.error = None
+        self._state = None  # DONE / FAILED / CANCELLED เมื่อจบ
+        self.created = time.time()
+        self.finished_at = None
+        self._futures = {}
+
+    @property
+    def status(self) -> str:
+        if self._state is not None:
+            return self._state
+        running = self.done or any(future.running() for future in self._futures.values())
+        return RUNNING if running else QUEUED
+
+    @property
+    def progress(self):
+        """(จำนวนไฟล์ที่เสร็จ, ทั้งหมด)"""
+        return len(self.done), len(self.kinds)
+
+    @property
+    def finished(self) -> bool:
+        return self._state is not None
+
+    def _finish(self, state: str, error: Exception | None = None):
+        self._state, self.error, self.finished_at = state, error, time.time()
+        self.artifacts = None  # ผลอยู่ใน LazyArtifacts ของ session แล้ว — job ที่เก็บไว้ถามสถานะไม่ต้องถือไฟล์
+
+
+class ExportQueue:
+    """
+    process pool แบบจำกัดขนาด + ตาราง job (job_id -> ExportJob)
+    ใช้ spawn: process ของ Streamlit มีหลาย thread จึงไม่ fork (worker import survey_engine เองครั้งเดียว)
+    cancel: งานที่ยังไม่เริ่มถูกถอนออกจาก pool; งานที่กำลังวาดอยู่ทำต่อจนจบแต่ผลถูกทิ้ง
+    """
+
+    def __init__(self, max_workers: int = EXPORT_WORKERS, max_jobs: int = EXPORT_MAX_JOBS,
+                 mp_context: str = "spawn"):
+        self.max_workers = max(1, max_workers)
+        self.max_jobs = max_jobs
+        self._mp_context = multiprocessing.get_context(mp_context)
+        self._executor = None
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self._mp_context)
+        return self._executor
+
+    def executor(self) -> ProcessPoolExecutor:
+        """pool เดียวกับที่ job ใช้ — ให้งานนอกคิว (เช่น build_bundle ตอนกดดาวน์โหลดทั้งหมด) ใช้ร่วม ไม่นับในเพดาน job"""
+        with self._lock:
+            return self._pool()
+
+    def active(self) -> int:
+        return sum(not job.finished for job in self._jobs.values())
+
+    def submit(self, artifacts: LazyArtifacts, kinds=DEFAULT_ARTIFACTS) -> ExportJob:
+        """ส่งไฟล์ที่ยังไม่มี (ไม่อยู่ในหน่วยความจำหรือ cache) ไปสร้างใน pool -> ExportJob; คิวเต็ม = QueueFull"""
+        unknown = set(kinds) - set(BUILDERS)
+        if unknown:
+            raise ValueError(f"unknown artifact(s): {', '.join(sorted(unknown))}")
+        missing = [kind for kind in kinds if not artifacts.load_cached(kind)]
+        job = ExportJob(artifacts, missing)
+        with self._lock:
+            self._prune()
+            if not missing:
+                job._finish(DONE)
+            elif self.active() >= self.max_jobs:
+                raise QueueFull(f"export queue is full ({self.max_jobs} jobs)")
+            else:
+                try:
+                    futures = {kind: self._pool().submit(BUILDERS[kind], artifacts.plan) for kind in missing}
+                except BrokenProcessPool:  # worker ตาย (เช่น หน่วยความจำไม่พอ) — สร้าง pool ใหม่แล้วลองอีกครั้ง
+                    self._executor = None
+                    futures = {kind: self._pool().submit(BUILDERS[kind], artifacts.plan) for kind in missing}
+                job._futures = futures
+            self._jobs[job.job_id] = job
+        for kind, future in job._futures.items():
+            future.add_done_callback(lambda f, kind=kind: self._finished(job, kind, f))
+        return job
+
+    def _finished(self, job: ExportJob, kind: str, future):
+        try:
+            data = future.result()
+        except CancelledError:
+            return
+        except BrokenProcessPool as e:
+            with self._lock:
+                self._executor = None
+            self._fail(job, e)
+            return
+        except Exception as e:
+            self._fail(job, e)
+            return
+        artifacts = job.artifacts
+        if job.finished or artifacts is None:  # ยกเลิก/ล้มเหลวไปแล้ว — ทิ้งผล
+            return
+        artifacts.put(kind, data)
+        with self._lock:
+            job.done.append(kind)
+            if len(job.done) == len(job.kinds) and not job.finished:
+                job._finish(DONE)
+
+    def _fail(self, job: ExportJob, error: Exception):
+        with self._lock:
+            if job.finished:
+                return
+            job._finish(FAILED, error)
+        for future in job._futures.values():
+            future.cancel()
+
+    def get(self, job_id: str | None) -> ExportJob | None:
+        return self._jobs.get(job_id) if job_id else None
+
+    def cancel(self, job_id: str | None) -> bool:
+        """ยกเลิก job ที่ยังไม่จบ -> True ถ้ายกเลิกได้"""
+        job = self.get(job_id)
+        with self._lock:
+            if job is None or job.finished:
+                return False
+            job._finish(CANCELLED)
+        for future in job._futures.values():
+            future.cancel()
+        return True
+
+    def _prune(self):
+        cutoff = time.time() - JOB_TTL
+        for job_id in [j for j, job in self._jobs.items() if job.finished and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def shutdown(self, wait: bool = True):
+        for job_id in list(self._jobs):
+            self.cancel(job_id)
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,206 @@
+# 🧪 FAKE SHEETS SERVER — HTTP server ในเครื่องที่ตอบแบบ Sheets v4 / Drive v3 (เฉพาะที่ sheets_provision ใช้)
+# ใช้ทดสอบ provisioning แบบ offline:
+#   python fake_sheets_server.py 8765
+#   SHEETS_API_ENDPOINT=http://127.0.0.1:8765/ streamlit run stline.py
+# หรือใน code:
+#   with FakeSheetsServer() as server:
+#       SheetsClient(api_endpoint=server.endpoint).provision(plan, "test")
+#       server.spreadsheets, server.calls, server.connections
+import json
+import re
+import sys
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+MAX_COLUMNS = 18278
+MAX_CELLS = 10_000_000
+
+_BATCH_UPDATE = re.compile(r"^/v4/spreadsheets/([^/:]+):batchUpdate$")
+_SPREADSHEET = re.compile(r"^/v4/spreadsheets/([^/:]+)$")
+_PERMISSIONS = re.compile(r"^(?:/drive/v3)?/files/([^/]+)/permissions$")  # api_endpoint แทนที่ทั้ง base URL รวม drive/v3
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive — นับ connection ได้ว่า client ใช้ซ้ำหรือไม่
+    server: "ThreadingHTTPServer"
+
+    def setup(self):
+        super().setup()
+        with self.server.fake._lock:
+            self.server.fake.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, payload: dict):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _dispatch(self, method: str):
+        fake = self.server.fake
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        path = unquote(urlsplit(self.path).path)
+        with fake._lock:
+            fake.calls.append((method, path))
+            if fake._failures:
+                status = fake._failures.pop(0)
+                self._reply(status, {"error": {"code": status, "message": "injected failure"}})
+                return
+        try:
+            body = json.loads(raw) if raw else {}
+            status, payload = fake.handle(method, path, body)
+        except ApiError as e:
+            status, payload = e.status, {"error": {"code": e.status, "message": str(e)}}
+        except ValueError as e:
+            status, payload = 400, {"error": {"code": 400, "message": f"invalid JSON: {e}"}}
+        self._reply(status, payload)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+
+class FakeSheetsServer:
+    """
+    เก็บ spreadsheet ไว้ใน dict (ไม่เขียนดิสก์)
+    calls = [(method, path)], connections = จำนวน TCP connection ที่เปิด
+    fail_next(n, status) = ตอบ error n ครั้งถัดไป (ทดสอบ retry/backoff)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.spreadsheets = {}
+        self.permissions = {}
+        self.calls = []
+        self.connections = 0
+        self._failures = []
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.fake = self
+        self._thread = None
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def fail_next(self, count: int = 1, status: int = 503):
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def start(self) -> "FakeSheetsServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ---------- API ----------
+    def handle(self, method: str, path: str, body: dict):
+        if method == "POST" and path == "/v4/spreadsheets":
+            return 200, self._create(body)
+        m = _BATCH_UPDATE.match(path)
+        if method == "POST" and m:
+            return 200, self._batch_update(m.group(1), body)
+        m = _SPREADSHEET.match(path)
+        if method == "GET" and m:
+            return 200, self._get(m.group(1))
+        m = _PERMISSIONS.match(path)
+        if method == "POST" and m:
+            self._get(m.group(1))
+            with self._lock:
+                self.permissions.setdefault(m.group(1), []).append(body)
+            return 200, {"id": uuid.uuid4().hex[:12], **body}
+        raise ApiError(404, f"no such method: {method} {path}")
+
+    def _get(self, spreadsheet_id: str) -> dict:
+        try:
+            return self.spreadsheets[spreadsheet_id]
+        except KeyError:
+            raise ApiError(404, f"spreadsheet not found: {spreadsheet_id}")
+
+    def _create(self, body: dict) -> dict:
+        sheets = body.get("sheets") or [{"properties": {"title": "Sheet1"}}]
+        ids, titles, cells = set(), set(), 0
+        for index, sheet in enumerate(sheets):
+            props = sheet.setdefault("properties", {})
+            props.setdefault("sheetId", index)
+            props.setdefault("index", index)
+            grid = props.setdefault("gridProperties", {})
+            rows, cols = grid.setdefault("rowCount", 1000), grid.setdefault("columnCount", 26)
+            if props["sheetId"] in ids or props.get("title") in titles:
+                raise ApiError(400, f"duplicate sheet: {props}")
+            if cols > MAX_COLUMNS:
+                raise ApiError(400, f"columnCount {cols} > {MAX_COLUMNS}")
+            for block in sheet.get("data", []):
+                for r, row in enumerate(block.get("rowData", []), start=block.get("startRow", 0)):
+                    if r >= rows or block.get("startColumn", 0) + len(row.get("values", [])) > cols:
+                        raise ApiError(400, f"data outside grid of sheet {props.get('title')!r}")
+            ids.add(props["sheetId"])
+            titles.add(props.get("title"))
+            cells += rows * cols
+            sheet.setdefault("dataValidations", [])
+        if cells > MAX_CELLS:
+            raise ApiError(400, f"{cells} cells > {MAX_CELLS}")
+
+        spreadsheet_id = uuid.uuid4().hex
+        resource = {
+            "spreadsheetId": spreadsheet_id,
+            "properties": body.get("properties", {}),
+            "sheets": sheets,
+            "spreadsheetUrl": f"{self.endpoint}spreadsheets/d/{spreadsheet_id}/edit",
+        }
+        with self._lock:
+            self.spreadsheets[spreadsheet_id] = resource
+        return resource
+
+    def _batch_update(self, spreadsheet_id: str, body: dict) -> dict:
+        spreadsheet = self._get(spreadsheet_id)
+        by_id = {s["properties"]["sheetId"]: s for s in spreadsheet["sheets"]}
+        replies = []
+        for request in body.get("requests", []):
+            if set(request) != {"setDataValidation"}:
+                raise ApiError(400, f"unsupported request: {sorted(request)}")
+            dv = request["setDataValidation"]
+            sheet = by_id.get(dv["range"].get("sheetId", 0))
+            if sheet is None:
+                raise ApiError(400, f"no sheet with id {dv['range'].get('sheetId')}")
+            grid = sheet["properties"]["gridProperties"]
+            if dv["range"].get("endRowIndex", 0) > grid["rowCount"] or \
+                    dv["range"].get("endColumnIndex", 0) > grid["columnCount"]:
+                raise ApiError(400, f"range outside grid: {dv['range']}")
+            sheet["dataValidations"].append(dv)
+            replies.append({})
+        return {"spreadsheetId": spreadsheet_id, "replies": replies}
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    server = FakeSheetsServer(port=port)
+    print(f"🧪 fake Sheets API at {server.endpoint} (Ctrl+C to stop)")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server._httpd.server_close()
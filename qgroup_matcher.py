@@ -0,0 +1,179 @@
+# 🌟 FUZZY MATCH — หา q_group ของคำถามจากคลังคำถาม
+import re
+import unicodedata
+from collections import defaultdict
+
+import numpy as np
+
+FUZZY_MATCH_THRESHOLD = 80
+NO_GROUP = "N/A"
+INDEX_MIN_ROWS = 2000     # คลังเล็กกว่านี้ cdist ทั้งก้อนเร็วกว่าใช้ index
+INDEX_CANDIDATES = 128    # จำนวนแถวสูงสุดที่ส่งไปให้คะแนน fuzzy ต่อคำถาม
+INDEX_RESCORE_MARGIN = 10  # candidate ไม่ครบและคะแนนดีสุด < threshold + margin → ให้คะแนนทั้งคลังซ้ำ
+
+_ZERO_WIDTH = re.compile("[\u200b\u200c\u200d\u2060\ufeff]")
+
+
+def clean_question(text):
+    text = str(text).strip().lower()
+    return re.sub(r"\d+$", "", text)
+
+
+def strip_invisible(text):
+    """ลบอักขระความกว้างศูนย์ (zero-width space/joiner, BOM) ที่มักติดมาจากการ copy/พิมพ์"""
+    return _ZERO_WIDTH.sub("", text)
+
+
+def thai_clusters(text):
+    """แยกเป็นกลุ่มตัวอักษร: สระบน/ล่างและวรรณยุกต์ (Mn) ติดไปกับพยัญชนะตัวหน้า"""
+    clusters = []
+    for ch in strip_invisible(text):
+        if clusters and unicodedata.category(ch) == "Mn":
+            clusters[-1] += ch
+        else:
+            clusters.append(ch)
+    return clusters
+
+
+def char_ngrams(text, n=2):
+    clusters = [c for c in thai_clusters(" ".join(str(text).split())) if c != " "]
+    if len(clusters) <= n:
+        return {"".join(clusters)} if clusters else set()
+    return {"".join(clusters[i:i + n]) for i in range(len(clusters) - n + 1)}
+
+
+class NgramIndex:
+    """
+    Inverted index: n-gram (ตาม thai_clusters) -> array ของแถวที่มี gram นั้น
+    ใช้คัด candidate ไม่กี่แถวก่อนให้คะแนน fuzzy แทนการไล่ทุกแถว
+    gram ที่พบในแถวจำนวนมาก (เกิน max_df) จะถูกข้ามเมื่อคำถามมี gram อื่นให้ใช้
+    """
+
+    def __init__(self, texts, n=2, max_df=0.05):
+        self.n = n
+        postings = defaultdict(list)
+        gram_counts = []
+        for i, text in enumerate(texts):
+            grams = char_ngrams(text, n)
+            gram_counts.append(len(grams))
+            for g in grams:
+                postings[g].append(i)
+        self._postings = {g: np.asarray(ids, dtype=np.int32) for g, ids in postings.items()}
+        self._gram_counts = np.asarray(gram_counts, dtype=np.int32)
+        self._max_postings = max(1, int(max_df * len(gram_counts)))
+
+    def __len__(self):
+        return len(self._gram_counts)
+
+    def candidates(self, text, limit=INDEX_CANDIDATES):
+        """
+        (แถว candidate เรียงตามลำดับในคลัง, complete)
+        complete=False เมื่อมีแถวที่อาจเกี่ยวข้องหลุดไป: ข้าม gram ที่พบบ่อย หรือถูกตัดเหลือ limit แถว
+        """
+        grams = char_ngrams(text, self.n)
+        lists = [self._postings[g] for g in grams if g in self._postings]
+        if not lists:
+            return np.empty(0, dtype=np.int32), True
+        rare = [p for p in lists if len(p) <= self._max_postings] or [min(lists, key=len)]
+        complete = len(rare) == len(lists)
+        ids, shared = np.unique(np.concatenate(rare), return_counts=True)
+        if len(ids) > limit:
+            # เรียงตาม containment (shared / gram ของฝั่งที่สั้นกว่า) ให้สอดคล้องกับ partial_ratio
+            denom = np.minimum(self._gram_counts[ids], len(grams)).clip(min=1)
+            ids = ids[np.argpartition(-(shared / denom), limit - 1)[:limit]]
+            complete = False
+        return np.sort(ids), complete
+
+
+class QGroupMatcher:
+    """
+    Matcher ที่สร้างครั้งเดียวต่อ business type: เก็บคำถามมาตรฐานที่ clean แล้ว
+    + รหัส group เป็น array แล้วให้คะแนนทุกแถวใน batch เดียวด้วย process.cdist
+    (คะแนน max(partial_ratio, token_sort_ratio) แบบ find_q_group เดิม, เสมอกันเอาแถวแรก)
+
+    คลังใหญ่ (>= INDEX_MIN_ROWS แถว) จะคัด candidate ผ่าน NgramIndex ก่อน — ผลเป็นค่าประมาณ:
+    ถ้า candidate ไม่ครบ (ข้าม gram ที่พบบ่อย / ตัดเหลือ INDEX_CANDIDATES) และคะแนนดีสุดยังต่ำกว่า
+    threshold + INDEX_RESCORE_MARGIN
+    จะให้คะแนนทั้งคลังซ้ำ (การตัดสิน match / N/A ใกล้ threshold จึงเท่ากับไล่ทุกแถว)
+    แต่คำถามที่ได้คะแนนสูงกว่านั้นอาจได้แถวอื่นที่คะแนนเท่ากันหรือต่ำกว่าเล็กน้อย (group อาจต่าง)
+    — อัตราที่ตรงกับการไล่ทุกแถววัดได้จาก benchmarks/bench_pipeline.py (index_recall)
+    """
+
+    def __init__(self, questions, groups, threshold=FUZZY_MATCH_THRESHOLD, use_index=None):
+        self.threshold = threshold
+        self._refs = tuple(clean_question(q) for q in questions)
+        names, codes = np.unique(np.asarray([str(g) for g in groups], dtype=object), return_inverse=True)
+        self._group_names = tuple(names)
+        self._group_codes = codes.astype(np.int32)
+        if use_index is None:
+            use_index = len(self._refs) >= INDEX_MIN_ROWS
+        self._index = NgramIndex(self._refs) if use_index else None
+
+    @classmethod
+    def from_sheets_data(cls, *sheets_data_list, threshold=FUZZY_MATCH_THRESHOLD, use_index=None):
+        """รับ sheets_data ได้หลายชุด (เช่น ทุก business type) — ชุดที่ส่งมาก่อนชนะเมื่อคะแนนเสมอ"""
+        questions, groups = [], []
+        for sheets_data in sheets_data_list:
+            for df in sheets_data.values():
+                if "standard_question_th" in df.columns and "q_group" in df.columns:
+                    questions.extend(df["standard_question_th"].astype(str).tolist())
+                    groups.extend(df["q_group"].astype(str).tolist())
+        return cls(questions, groups, threshold=threshold, use_index=use_index)
+
+    def __len__(self):
+        return len(self._refs)
+
+    @staticmethod
+    def _scores(cleaned, refs):
+        """
+        คะแนน (len(cleaned) x len(refs)) = max ของสอง scorer
+        เก็บเป็น float64 เท่ากับ fuzz.* ที่ find_q_group เดิมใช้ — ปัดเป็นจำนวนเต็มจะทำให้แถวที่คะแนนต่างกันไม่ถึง 1
+        เสมอกัน (แถวแรกชนะแทนแถวที่ดีกว่า) และ 79.5-79.99 ผ่าน threshold 80
+        """
+        from rapidfuzz import fuzz, process  # โหลดเมื่อต้องให้คะแนนจริง (หน้าเลือกคำถามไม่ต้องใช้)
+        partial = process.cdist(cleaned, refs, scorer=fuzz.partial_ratio, dtype=np.float64, workers=-1)
+        token = process.cdist(cleaned, refs, scorer=fuzz.token_sort_ratio, dtype=np.float64, workers=-1)
+        return np.maximum(partial, token)
+
+    def _group_of(self, row, score):
+        return self._group_names[self._group_codes[row]] if score >= self.threshold else NO_GROUP
+
+    def match_many(self, queries):
+        queries = list(queries)
+        if not queries or not self._refs:
+            return [NO_GROUP] * len(queries)
+        cleaned = [clean_question(q) for q in queries]
+        if self._index is None:
+            scores = self._scores(cleaned, self._refs)
+            best = scores.argmax(axis=1)  # argmax คืนตัวแรกเมื่อเสมอ = แถวแรกที่ได้คะแนนสูงสุด
+            return [self._group_of(b, s) for b, s in zip(best, scores[np.arange(len(cleaned)), best])]
+
+        results = []
+        for q in cleaned:
+            if len(char_ngrams(q, self._index.n)) <= 1:
+                rows, complete = np.arange(len(self._refs)), True  # คำถามสั้นมาก index คัดไม่ได้ → ไล่ทั้งคลัง
+            else:
+                rows, complete = self._index.candidates(q)
+            if len(rows) == 0:
+                results.append(NO_GROUP)
+                continue
+            scores = self._scores([q], [self._refs[r] for r in rows])[0]
+            b = int(scores.argmax())
+            if not complete and scores[b] < self.threshold + INDEX_RESCORE_MARGIN:
+                # แถวที่ดีกว่าอาจหลุดไปจาก candidate — ให้คะแนนทั้งคลังเพื่อไม่ให้ match / N/A พลิก
+                rows = np.arange(len(self._refs))
+                scores = self._scores([q], self._refs)[0]
+                b = int(scores.argmax())
+            results.append(self._group_of(rows[b], scores[b]))
+        return results
+
+    def match(self, base_question):
+        return self.match_many([base_question])[0]
+
+
+def find_q_group(base_question, sheets_data):
+    """
+    คง logic เดิมไว้: หา group จากคลังคำถามของ business type ที่เลือก (sheets_data)
+    (ถ้าเรียกซ้ำบ่อยให้สร้าง QGroupMatcher ครั้งเดียวแล้วใช้ match_many แทน)
+    """
+    return QGroupMatcher.from_sheets_data(sheets_data).match(base_question)
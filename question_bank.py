@@ -0,0 +1,523 @@
+# 🧰 คลังคำถาม + พจนานุกรมสินค้า (โหลดครั้งเดียวต่อ process — Streamlit rerun ไม่ต้อง build ใหม่)
+import hashlib
+import json
+from functools import lru_cache
+from types import MappingProxyType
+
+import pandas as pd
+
+# 🧰 QUESTION BANK (ใส่คำถามจริงของคุณแทนที่ตัวอย่างด้านล่าง)
+# โครงสร้าง: QUESTION_BANK[BUSINESS_TYPE][SHEET_NAME] = list ของ dict ที่มี standard_question_th, q_group
+# sheet name ใช้ชื่อเดียวกับตอนอ่านจาก Excel เดิม เช่น "Respondent Profile", "Customer & Market", "Product List", "Product & Details"
+QUESTION_BANK = {
+    "Bulk transformer": {
+        "Respondent Profile": [
+            {"standard_question_th": "ชื่อ", "q_group": "Respondent Profile"},
+            {"standard_question_th": "ชื่อธุรกิจ", "q_group": "Respondent Profile"},
+            {"standard_question_th": "จังหวัด (ตามที่อยู่)", "q_group": "Respondent Profile"},
+            {"standard_question_th": "เบอร์โทร", "q_group": "Respondent Profile"},
+            {"standard_question_th": "เพศ", "q_group": "Respondent Profile"},
+            {"standard_question_th": "อายุ", "q_group": "Respondent Profile"},                        
+            {"standard_question_th": "ตำแหน่ง", "q_group": "Respondent Profile"},
+            {"standard_question_th": "Persona", "q_group": "Respondent Profile"},
+
+        ],
+        "Customer & Market": [
+            {"standard_question_th": "ประเภทงานก่อสร้างของลูกค้าหลัก", "q_group": "Customer & Market"},
+            {"standard_question_th": "วิธีสื่อสารกับลูกค้าแบบออฟไลน์", "q_group": "Customer & Market"},
+            {"standard_question_th": "วิธีสื่อสารกับลูกค้าแบบออนไลน์", "q_group": "Customer & Market"},
+            {"standard_question_th": "ช่วงอายุของลูกค้า", "q_group": "Customer & Market"},
+            {"standard_question_th": "วิธีดูแลลูกค้าประจำของร้าน", "q_group": "Customer & Market"},
+            {"standard_question_th": "ระบบสะสมแต้มของตัวเอง", "q_group": "Customer & Market"},
+            {"standard_question_th": "ของแจกที่ลูกค้าชอบ", "q_group": "Customer & Market"},
+            {"standard_question_th": "ช่องทางการขายที่ยอดมากที่สุด", "q_group": "Customer & Market"},
+            {"standard_question_th": "ช่องทางการซื้อของลูกค้าส่วนใหญ่", "q_group": "Customer & Market"},
+
+        ],
+        "Business & Strategy": [
+            {"standard_question_th": "Dealer", "q_group": "Business & Strategy"},
+            {"standard_question_th": "BP Model", "q_group": "Business & Strategy"},
+            {"standard_question_th": "ความเป็นมาของธุรกิจ", "q_group": "Business & Strategy"},
+            {"standard_question_th": "มีคนรับช่วงธุรกิจต่อหรือไม่", "q_group": "Business & Strategy"},
+            {"standard_question_th": "ธุรกิจอื่นที่ทำควบคู่กัน", "q_group": "Business & Strategy"},
+            {"standard_question_th": "ธุรกิจอื่นที่ทำควบคู่กัน (detail)", "q_group": "Business & Strategy"},
+            {"standard_question_th": "แผนขยายธุรกิจอื่นๆ", "q_group": "Business & Strategy"},
+            {"standard_question_th": "แผนขยายธุรกิจหลัก", "q_group": "Business & Strategy"},
+
+        ],
+        "Pain Points & Needs": [
+            {"standard_question_th": "need ในขั้นตอนการทำงาน", "q_group": "Pain Points & Needs"},
+            {"standard_question_th": "pain ในขั้นตอนการทำงาน", "q_group": "Pain Points & Needs"},
+            {"standard_question_th": "แก้ไข pain ในขั้นตอนการทำงานอย่างไร", "q_group": "Pain Points & Needs"},
+            {"standard_question_th": "สิ่งที่อยากให้ SCG สนับสนุน/ช่วยเหลือ", "q_group": "Pain Points & Needs"},
+            {"standard_question_th": "สิ่งที่อยากให้ SCG สนับสนุน/ช่วยเหลือ (detail)", "q_group": "Pain Points & Needs"},
+            
+        ],
+        "Product & Process": [
+            {"standard_question_th": "ปูน SCG ที่ใช้ในกระบวนการผลิต", "q_group": "Product & Process"},
+            {"standard_question_th": "ปัจจัยสำคัญในการเลือกซื้อปูน เสือ/SCG", "q_group": "Product & Process"},
+            {"standard_question_th": "แบรนด์ขายดี", "q_group": "Product & Process"},
+            {"standard_question_th": "สินค้าอื่นที่ผลิตขาย", "q_group": "Product & Process"},
+            {"standard_question_th": "กลยุทธ์รักษาฐานลูกค้า และสู้กับคู่แข่ง", "q_group": "Product & Process"},
+            {"standard_question_th": "ปัจจัยเสี่ยงต่อธุรกิจ", "q_group": "Product & Process"},
+            {"standard_question_th": "ปัจจัยสำคัญของการผลิต", "q_group": "Product & Process"},
+            {"standard_question_th": "ความสำคัญของคุณภาพปูนในกระบวนการผลิต", "q_group": "Product & Process"},
+            {"standard_question_th": "คุณสมบัติปูนที่สำคัญ", "q_group": "Product & Process"},
+            {"standard_question_th": "คุณสมบัติสำคัญในกระบวนการผลิตสินค้าคอนกรีตขายดี", "q_group": "Product & Process"},
+            {"standard_question_th": "คุณสมบัติของสินค้าคอนกรีตขายดี", "q_group": "Product & Process"},
+            {"standard_question_th": "วิธีการทำงานในส่วน Pre-Stressed", "q_group": "Product & Process"},
+            {"standard_question_th": "วิธีการทำงานในส่วน RMC", "q_group": "Product & Process"},
+            {"standard_question_th": "วิธีการทำงานในส่วน Non-Prestressed", "q_group": "Product & Process"},
+            {"standard_question_th": "กระบวนการทำงานในโรงหล่อที่สำคัญ", "q_group": "Product & Process"},
+            {"standard_question_th": "แหล่งวัตถุดิบ", "q_group": "Product & Process"},
+            {"standard_question_th": "วิธีเช็คคุณภาพวัตถุดิบ", "q_group": "Product & Process"},
+            {"standard_question_th": "การตรวจสอบคุณภาพสินค้า", "q_group": "Product & Process"},
+
+        ],        
+    },
+    "Bag transformer": {
+        "Respondent Profile": [
+            {"standard_question_th": "ชื่อ", "q_group": "Respondent Profile"},
+            {"standard_question_th": "ชื่อธุรกิจ", "q_group": "Respondent Profile"},
+            {"standard_question_th": "จังหวัด (ตามที่อยู่)", "q_group": "Respondent Profile"},
+            {"standard_question_th": "เบอร์โทร", "q_group": "Respondent Profile"},
+            {"standard_question_th": "เพศ", "q_group": "Respondent Profile"},
+            {"standard_question_th": "อายุ", "q_group": "Respondent Profile"},                        
+            {"standard_question_th": "ตำแหน่ง", "q_group": "Respondent Profile"},
+            {"standard_question_th": "Persona", "q_group": "Respondent Profile"},
+
+        ],
+        "Customer & Market": [
+            {"standard_question_th": "ประเภทงานก่อสร้างของลูกค้าหลัก", "q_group": "Customer & Market"},
+            {"standard_question_th": "วิธีสื่อสารกับลูกค้าแบบออฟไลน์", "q_group": "Customer & Market"},
+            {"standard_question_th": "วิธีสื่อสารกับลูกค้าแบบออนไลน์", "q_group": "Customer & Market"},
+        ],
+        "Business & Strategy": [
+            {"standard_question_th": "Dealer", "q_group": "Business & Strategy"},
+            {"standard_question_th": "BP Model", "q_group": "Business & Strategy"},
+            {"standard_question_th": "ความเป็นมาของธุรกิจ", "q_group": "Business & Strategy"},
+            {"standard_question_th": "มีคนรับช่วงธุรกิจต่อหรือไม่", "q_group": "Business & Strategy"},
+            {"standard_question_th": "ธุรกิจอื่นที่ทำควบคู่กัน", "q_group": "Business & Strategy"},
+            {"standard_question_th": "แผนขยายธุรกิจอื่นๆ", "q_group": "Business & Strategy"},
+            {"standard_question_th": "แผนขยายธุรกิจหลัก", "q_group": "Business & Strategy"},
+        ],
+        "Pain Points & Needs": [
+            {"standard_question_th": "need ในขั้นตอนการทำงาน", "q_group": "Pain Points & Needs"},
+            {"standard_question_th": "pain ในขั้นตอนการทำงาน", "q_group": "Pain Points & Needs"},
+            {"standard_question_th": "แก้ไข pain ในขั้นตอนการทำงานอย่างไร", "q_group": "Pain Points & Needs"},
+            {"standard_question_th": "สิ่งที่อยากให้ SCG สนับสนุน/ช่วยเหลือ", "q_group": "Pain Points & Needs"},
+            {"standard_question_th": "สิ่งที่อยากให้ SCG สนับสนุน/ช่วยเหลือ (detail)", "q_group": "Pain Points & Needs"},
+            
+        ],
+        "Product & Process": [
+            {"standard_question_th": "ปูน SCG ที่ใช้ในกระบวนการผลิต", "q_group": "Product & Process"},
+            {"standard_question_th": "ปัจจัยสำคัญในการเลือกซื้อปูน เสือ/SCG", "q_group": "Product & Process"},
+            {"standard_question_th": "แบรนด์ขายดี", "q_group": "Product & Process"},
+            {"standard_question_th": "สินค้าอื่นที่ผลิตขาย", "q_group": "Product & Process"},
+            {"standard_question_th": "กลยุทธ์รักษาฐานลูกค้า และสู้กับคู่แข่ง", "q_group": "Product & Process"},
+            {"standard_question_th": "ปัจจัยเสี่ยงต่อธุรกิจ", "q_group": "Product & Process"},
+            {"standard_question_th": "ปัจจัยสำคัญของการผลิต", "q_group": "Product & Process"},
+            {"standard_question_th": "ความสำคัญของคุณภาพปูนในกระบวนการผลิต", "q_group": "Product & Process"},
+            {"standard_question_th": "คุณสมบัติปูนที่สำคัญ", "q_group": "Product & Process"},
+            {"standard_question_th": "คุณสมบัติสำคัญในกระบวนการผลิตสินค้าคอนกรีตขายดี", "q_group": "Product & Process"},
+            {"standard_question_th": "คุณสมบัติของสินค้าคอนกรีตขายดี", "q_group": "Product & Process"},
+            {"standard_question_th": "วิธีการทำงานในส่วน Prestressed", "q_group": "Product & Process"},
+            {"standard_question_th": "วิธีการทำงานในส่วน RMC", "q_group": "Product & Process"},
+            {"standard_question_th": "วิธีการทำงานในส่วน Non-Prestressed", "q_group": "Product & Process"},
+            {"standard_question_th": "กระบวนการทำงานในโรงหล่อที่สำคัญ", "q_group": "Product & Process"},
+            {"standard_question_th": "แหล่งวัตถุดิบ", "q_group": "Product & Process"},
+            {"standard_question_th": "วิธีเช็คคุณภาพวัตถุดิบ", "q_group": "Product & Process"},
+            {"standard_question_th": "การตรวจสอบคุณภาพสินค้า", "q_group": "Product & Process"},
+        ],        
+    },
+    "Subdealer & Bag transformer": {
+        "Respondent Profile": [
+            {"standard_question_th": "บริษัทรับเหมาก่อสร้าง", "q_group": "Respondent Profile"},
+            {"standard_question_th": "ชื่อ", "q_group": "Respondent Profile"},
+            {"standard_question_th": "เบอร์โทร", "q_group": "Respondent Profile"},
+            {"standard_question_th": "เพศ", "q_group": "Respondent Profile"},
+            {"standard_question_th": "อายุ", "q_group": "Respondent Profile"},
+            {"standard_question_th": "ตำแหน่ง", "q_group": "Respondent Profile"},
+            {"standard_question_th": "จังหวัด (ตามที่อยู่)", "q_group": "Respondent Profile"},
+        ],
+        "Customer & Market": [
+            {"standard_question_th": "ประเภทงานก่อสร้างของลูกค้าหลัก", "q_group": "Customer & Market"},
+            {"standard_question_th": "ยอดซื้อเฉลี่ยของลูกค้า (บาท/บิล)", "q_group": "Customer & Market"},
+            {"standard_question_th": "สัดส่วนลูกค้าโทรสั่ง", "q_group": "Customer & Market"},
+            {"standard_question_th": "สัดส่วนลูกค้าไลน์สั่ง", "q_group": "Customer & Market"},
+            {"standard_question_th": "สัดส่วนลูกค้าสั่งที่ร้าน", "q_group": "Customer & Market"},
+            {"standard_question_th": "กลุ่มลูกค้าประจำของร้าน", "q_group": "Customer & Market"},
+            {"standard_question_th": "วิธีดูแลลูกค้าประจำของร้าน", "q_group": "Customer & Market"},
+        ],
+        "Business & Strategy": [
+            {"standard_question_th": "Dealer", "q_group": "Business & Strategy"},
+            {"standard_question_th": "สถานการณ์ตลาด", "q_group": "Business & Strategy"},
+            {"standard_question_th": "สถานการณ์แข่งขันด้านราคา", "q_group": "Business & Strategy"},
+            {"standard_question_th": "Price Gap ที่เหมาะสม", "q_group": "Business & Strategy"},
+            {"standard_question_th": "สรุปช่องทางที่ลูกค้าสั่งซื้อสินค้า", "q_group": "Business & Strategy"},
+            {"standard_question_th": "รูปแบบการชำระเงิน", "q_group": "Business & Strategy"},
+            {"standard_question_th": "แฟนพันธ์แท้ปูนเสือ/SCG", "q_group": "Business & Strategy"},
+            {"standard_question_th": "Capacity หน้าร้าน (ตัน)", "q_group": "Business & Strategy"},
+            {"standard_question_th": "Capacity รวมทั้งร้าน (ตัน)", "q_group": "Business & Strategy"},
+            {"standard_question_th": "มีคนรับช่วงธุรกิจต่อหรือไม่", "q_group": "Business & Strategy"},
+            {"standard_question_th": "ธุรกิจอื่นที่ทำควบคู่กัน", "q_group": "Business & Strategy"},
+            {"standard_question_th": "แผนขยายธุรกิจ", "q_group": "Business & Strategy"},
+            {"standard_question_th": "ทำธุรกิจโรงหล่อควบคู่ร้านวัสดุก่อสร้าง", "q_group": "Business & Strategy"},            
+        ],
+        "Pain Points & Needs": [
+            {"standard_question_th": "need ในขั้นตอนการทำงาน", "q_group": "Pain Points & Needs"},
+            {"standard_question_th": "pain ในขั้นตอนการทำงาน", "q_group": "Pain Points & Needs"},
+            {"standard_question_th": "แก้ไข pain ในขั้นตอนการทำงานอย่างไร", "q_group": "Pain Points & Needs"},
+            {"standard_question_th": "สิ่งที่อยากให้ SCG สนับสนุน/ช่วยเหลือ", "q_group": "Pain Points & Needs"},
+            {"standard_question_th": "สิ่งที่อยากให้ SCG สนับสนุน/ช่วยเหลือ (detail)", "q_group": "Pain Points & Needs"},
+            
+        ],
+        "Product & Process": [
+            {"standard_question_th": "ปูน SCG ที่ใช้ในกระบวนการผลิต", "q_group": "Business & Strategy"},
+            {"standard_question_th": "สินค้าหลักที่ผลิต", "q_group": "Business & Strategy"},
+            {"standard_question_th": "สินค้าขายดี", "q_group": "Business & Strategy"},
+            {"standard_question_th": "กลุ่มลูกค้าหลักของธุรกิจโรงหล่อ", "q_group": "Business & Strategy"},
+            {"standard_question_th": "แหล่งวัตถุดิบและวิธีเช็คคุณภาพ", "q_group": "Business & Strategy"},
+            {"standard_question_th": "ระบบขายหน้าร้าน", "q_group": "Product & Process"},
+            {"standard_question_th": "แบรนด์ที่ขายดี", "q_group": "Product & Process"},
+            {"standard_question_th": "ปัจจัยสำคัญในการเลือกซื้อปูน เสือ/SCG", "q_group": "Product & Process"},
+            {"standard_question_th": "กลยุทธ์รักษาฐานลูกค้า และสู้กับคู่แข่ง", "q_group": "Product & Process"},
+            {"standard_question_th": "ปัจจัยสำคัญของการผลิต", "q_group": "Product & Process"},            
+        ],   
+        "Product List": [
+            {"standard_question_th": "ก่อ-Grey", "q_group": "Product & Details"},
+            {"standard_question_th": "ก่อ-Mortar", "q_group": "Product & Details"},
+            {"standard_question_th": "ก่อ-Mortar-LW", "q_group": "Product & Details"},
+            {"standard_question_th": "ฉาบ-Grey", "q_group": "Product & Details"},
+            {"standard_question_th": "ฉาบ-Mortar", "q_group": "Product & Details"},
+            {"standard_question_th": "ฉาบ-Mortar-LW", "q_group": "Product & Details"},
+            {"standard_question_th": "ฉาบ-Grey-จับเซี๊ยม", "q_group": "Product & Details"},
+            {"standard_question_th": "ฉาบ-Mortar-จับเซี๊ยม", "q_group": "Product & Details"},
+            {"standard_question_th": "ฉาบบาง-Mortar-สกิมโค้ท", "q_group": "Product & Details"},
+            {"standard_question_th": "เทโครงสร้าง-Grey", "q_group": "Product & Details"},
+            {"standard_question_th": "เทโครงสร้าง-Mortar", "q_group": "Product & Details"},
+            {"standard_question_th": "เทโครงสร้าง-RMC", "q_group": "Product & Details"},
+            {"standard_question_th": "เทเสาเอ็น-Grey", "q_group": "Product & Details"},
+            {"standard_question_th": "เทเสาเอ็น-Mortar", "q_group": "Product & Details"},
+            {"standard_question_th": "เทปรับพื้น-Grey", "q_group": "Product & Details"},
+            {"standard_question_th": "เทปรับพื้น-Mortar", "q_group": "Product & Details"},
+            {"standard_question_th": "เทปรับพื้น-RMC", "q_group": "Product & Details"},
+            {"standard_question_th": "ปูกระเบื้อง-Mortar-TA", "q_group": "Product & Details"},
+            {"standard_question_th": "ปูกระเบื้อง-Mortar-TG", "q_group": "Product & Details"},
+            {"standard_question_th": "ผนัง-อิฐมอญ", "q_group": "Product & Details"},
+            {"standard_question_th": "ผนัง-อิฐบล็อก", "q_group": "Product & Details"},
+            {"standard_question_th": "ผนัง-อิฐมวลเบา", "q_group": "Product & Details"},
+            {"standard_question_th": "ผนัง-CLC", "q_group": "Product & Details"},
+            {"standard_question_th": "ผนัง-Wall system", "q_group": "Product & Details"},
+            {"standard_question_th": "สี-รองพื้น", "q_group": "Product & Details"},
+            {"standard_question_th": "สี-สีจริง", "q_group": "Product & Details"},
+            {"standard_question_th": "อื่นๆ-Water proof", "q_group": "Product & Details"},
+            {"standard_question_th": "อื่นๆ-Non shrink", "q_group": "Product & Details"},
+            {"standard_question_th": "อื่นๆ-White", "q_group": "Product & Details"},
+        ],
+        "Product & Details": [
+            {"standard_question_th": "ยี่ห้อ", "q_group": "Product & Details"},
+            {"standard_question_th": "ราคาหน้าร้าน", "q_group": "Product & Details"},
+            {"standard_question_th": "ราคาทุน", "q_group": "Product & Details"},
+            {"standard_question_th": "สต็อก", "q_group": "Product & Details"},
+        ],
+        "Special Topic": [
+            {"standard_question_th": "Giant Banner", "q_group": "Special Topic"},
+            {"standard_question_th": "รูปแบบบิลที่ใช้ในแต้มปูน", "q_group": "Special Topic"},
+            {"standard_question_th": "เหตุผลที่เป็นแฟนพันธุ์แท้ปูนเสือ/SCG", "q_group": "Special Topic"},
+        ],
+    },
+    "Contractor": {
+         "Respondent Profile": [
+            {"standard_question_th": "ชื่อ", "q_group": "Respondent Profile"},
+            {"standard_question_th": "ชื่อเล่น", "q_group": "Respondent Profile"},
+            {"standard_question_th": "เบอร์โทร", "q_group": "Respondent Profile"},
+            {"standard_question_th": "เพศ", "q_group": "Respondent Profile"},
+            {"standard_question_th": "อายุ", "q_group": "Respondent Profile"},
+            {"standard_question_th": "ตำแหน่ง", "q_group": "Respondent Profile"},
+            {"standard_question_th": "จำนวนทีมงาน", "q_group": "Respondent Profile"},
+            {"standard_question_th": "ประสบการณ์ทำงาน", "q_group": "Respondent Profile"},
+            {"standard_question_th": "กิจวัตรประจำวันและงานอดิเรก", "q_group": "Respondent Profile"},
+            {"standard_question_th": "เป้าหมายชีวิต", "q_group": "Respondent Profile"},
+            {"standard_question_th": "สิ่งที่อยากพัฒนาเพื่อให้ธุรกิจดีขึ้น", "q_group": "Respondent Profile"},
+            {"standard_question_th": "ประวัติการศึกษาและจุดเริ่มต้นการทำงาน", "q_group": "Respondent Profile"},
+            {"standard_question_th": "สื่อที่ใช้ในการรับข้อมูล", "q_group": "Respondent Profile"},
+            {"standard_question_th": "lifestyle", "q_group": "Respondent Profile"},
+        ],
+        "Customer's Journey": [
+            {"standard_question_th": "ค้นหาข้อมูลก่อนซื้ออย่างไร", "q_group": "Customer's Journey"},
+            {"standard_question_th": "ปัจจัยสำคัญในการเลือกซื้อปูน", "q_group": "Customer's Journey"},
+            {"standard_question_th": "ร้านค้าที่ส่งผลต่อการซื้อปูน", "q_group": "Customer's Journey"},
+            {"standard_question_th": "สื่อ/ช่องทางที่ส่งผลต่อการซื้อปูน", "q_group": "Customer's Journey"},
+            {"standard_question_th": "ร้าน Modern Trade ที่ซื้อวัสดุุ", "q_group": "Customer's Journey"},
+            {"standard_question_th": "สินค้าที่ซื้อมากที่สุดจาก Modern Trade", "q_group": "Customer's Journey"},
+            {"standard_question_th": "โมเดิร์นเทรดที่เป็นสมาชิกในการสะสมแต้ม", "q_group": "Customer's Journey"},
+            {"standard_question_th": "ระบบสะสมแต้มนี้ตอบโจทย์คุณในด้านใด", "q_group": "Customer's Journey"},
+            {"standard_question_th": "สิ่งที่ไม่ประทับใจ", "q_group": "Customer's Journey"},
+            {"standard_question_th": "รู้สึกว่าการสะสมคะแนนยุ่งยากหรือไม่", "q_group": "Customer's Journey"},
+            {"standard_question_th": "วิธีสะสมแต้ม", "q_group": "Customer's Journey"},
+            {"standard_question_th": "รูปแบบบิลที่ใช้ในแต้มปูน", "q_group": "Customer's Journey"},
+            {"standard_question_th": "เหตุผลที่เป็นแฟนพันธุ์แท้ปูนเสือ/SCG", "q_group": "Customer's Journey"},
+        ],
+        "Customer & Market": [
+            {"standard_question_th": "ใครเป็นผู้ตัดสินใจซื้อวัสดุก่อสร้าง", "q_group": "Customer & Market"},
+            {"standard_question_th": "ประเภทงานก่อสร้างที่ให้บริการเป็นหลัก", "q_group": "Customer & Market"},
+            {"standard_question_th": "แบรนด์ใดที่คุณมองว่าใกล้เคียงกับปูนเสือ/SCG", "q_group": "Customer & Market"},
+            {"standard_question_th": "วิธีการสั่งซื้อปูนและวัสดุก่อสร้าง", "q_group": "Customer & Market"},
+            {"standard_question_th": "%สั่งซื้อปูนและวัสดุก่อสร้างทางโทรศัพท์", "q_group": "Customer & Market"},
+            {"standard_question_th": "%สั่งซื้อปูนและวัสดุก่อสร้างทางไลน์", "q_group": "Customer & Market"},
+            {"standard_question_th": "%สั่งซื้อปูนและวัสดุก่อสร้างที่หน้าร้าน", "q_group": "Customer & Market"},
+            {"standard_question_th": "วิธีการจ่ายเงิน (เงินสด, เครดิต, เงินสดและเครดิต)", "q_group": "Customer & Market"},
+            {"standard_question_th": "ยอดซื้อปูน และวัสดุก่อสร้างโดยเฉลี่ย (บาทต่อบิล)", "q_group": "Customer & Market"},            
+            {"standard_question_th": "สิ่งที่ SCG มีแต่เจ้าอื่นไม่มี", "q_group": "Customer & Market"},
+        ],
+        "Business & Strategy": [
+            {"standard_question_th": "ชื่อบริษัทรับเหมาก่อสร้าง", "q_group": "Business & Strategy"},
+            {"standard_question_th": "ชื่อโครงการในวันที่เข้าสัมภาษณ์", "q_group": "Business & Strategy"},
+            {"standard_question_th": "ภาค (ตามที่อยู่)", "q_group": "Business & Strategy"},
+            {"standard_question_th": "จังหวัด (ตามที่อยู่)", "q_group": "Business & Strategy"},
+            {"standard_question_th": "จังหวัดที่รับบริการ", "q_group": "Business & Strategy"},
+            {"standard_question_th": "ร้านประจำที่ซื้อวัสดุก่อสร้าง", "q_group": "Business & Strategy"},            
+            {"standard_question_th": "วิธีคิดค่าบริการงานก่อสร้าง", "q_group": "Business & Strategy"},
+            {"standard_question_th": "มูลค่างานต่อปี", "q_group": "Business & Strategy"},
+            {"standard_question_th": "ร้านประจำที่ซื้อปูน เสือ/SCG", "q_group": "Business & Strategy"},            
+            {"standard_question_th": "ความถี่ในการสั่งปูน (ครั้ง/สัปดาห์)", "q_group": "Business & Strategy"},
+            {"standard_question_th": "ความถี่ในการเข้าร้านวัสดุก่อสร้าง (ครั้ง/สัปดาห์)", "q_group": "Business & Strategy"},
+            {"standard_question_th": "มีคนรับช่วงธุรกิจต่อหรือไม่", "q_group": "Business & Strategy"},
+            {"standard_question_th": "ธุรกิจอื่นที่ทำควบคู่กัน", "q_group": "Business & Strategy"},
+        ],
+        "Pain Points & Needs": [
+            {"standard_question_th": "ปัญหาที่พบในการทำงานของช่าง", "q_group": "Pain Points & Needs"},
+            {"standard_question_th": "ปัญหาที่พบในการจัดซื้อวัสดุก่อสร้าง", "q_group": "Pain Points & Needs"},
+            {"standard_question_th": "สิ่งที่อยากให้ SCG พัฒนา", "q_group": "Pain Points & Needs"},
+            {"standard_question_th": "สิ่งที่อยากให้ SCG สนับสนุน/ช่วยเหลือ", "q_group": "Pain Points & Needs"},                        
+        ],
+        "Product & Process": [
+            {"standard_question_th": "ปูนเสือ/SCG ที่ซื้อไป นิยมใช้กับงานประเภทใด", "q_group": "Product & Process"},
+            {"standard_question_th": "สินค้าที่มักซื้อคู่กับปูน", "q_group": "Product & Process"},
+            {"standard_question_th": "ปริมาณสินค้าที่มักซื้อคู่กับปูน", "q_group": "Product & Process"},
+            {"standard_question_th": "สนใจทดลองใช้สินค้า scg หรือไม่", "q_group": "Product & Process"},
+            {"standard_question_th": "ปูน หรือสินค้า scg ที่สนใจทดลองใช้", "q_group": "Product & Process"},            
+        ],
+        # Contractor อาจไม่มี cross-product ก็ได้ — ถ้าไม่มี ก็ลบสองชีตนี้ออก
+        "Product List": [
+            {"standard_question_th": "ก่อ-Grey", "q_group": "Product & Details"},
+            {"standard_question_th": "ก่อ-Mortar", "q_group": "Product & Details"},
+            {"standard_question_th": "ก่อ-Mortar-LW", "q_group": "Product & Details"},
+            {"standard_question_th": "ฉาบ-Grey", "q_group": "Product & Details"},
+            {"standard_question_th": "ฉาบ-Mortar", "q_group": "Product & Details"},
+            {"standard_question_th": "ฉาบ-Mortar-LW", "q_group": "Product & Details"},
+            {"standard_question_th": "ฉาบ-Grey-จับเซี๊ยม", "q_group": "Product & Details"},
+            {"standard_question_th": "ฉาบ-Mortar-จับเซี๊ยม", "q_group": "Product & Details"},
+            {"standard_question_th": "ฉาบบาง-Mortar-สกิมโค้ท", "q_group": "Product & Details"},
+            {"standard_question_th": "เทโครงสร้าง-Grey", "q_group": "Product & Details"},
+            {"standard_question_th": "เทโครงสร้าง-Mortar", "q_group": "Product & Details"},
+            {"standard_question_th": "เทโครงสร้าง-RMC", "q_group": "Product & Details"},
+            {"standard_question_th": "เทเสาเอ็น-Grey", "q_group": "Product & Details"},
+            {"standard_question_th": "เทเสาเอ็น-Mortar", "q_group": "Product & Details"},
+            {"standard_question_th": "เทปรับพื้น-Grey", "q_group": "Product & Details"},
+            {"standard_question_th": "เทปรับพื้น-Mortar", "q_group": "Product & Details"},
+            {"standard_question_th": "เทปรับพื้น-RMC", "q_group": "Product & Details"},
+            {"standard_question_th": "ปูกระเบื้อง-Mortar-TA", "q_group": "Product & Details"},
+            {"standard_question_th": "ปูกระเบื้อง-Mortar-TG", "q_group": "Product & Details"},
+            {"standard_question_th": "ผนัง-อิฐมอญ", "q_group": "Product & Details"},
+            {"standard_question_th": "ผนัง-อิฐบล็อก", "q_group": "Product & Details"},
+            {"standard_question_th": "ผนัง-อิฐมวลเบา", "q_group": "Product & Details"},
+            {"standard_question_th": "ผนัง-CLC", "q_group": "Product & Details"},
+            {"standard_question_th": "ผนัง-Wall system", "q_group": "Product & Details"},
+            {"standard_question_th": "สี-รองพื้น", "q_group": "Product & Details"},
+            {"standard_question_th": "สี-สีจริง", "q_group": "Product & Details"},
+            {"standard_question_th": "อื่นๆ-Water proof", "q_group": "Product & Details"},
+            {"standard_question_th": "อื่นๆ-Non shrink", "q_group": "Product & Details"},
+            {"standard_question_th": "อื่นๆ-White", "q_group": "Product & Details"},
+        ],
+        "Product & Details": [
+            {"standard_question_th": "ยี่ห้อ/รุ่น", "q_group": "Product & Details"},
+            {"standard_question_th": "ใช้แตกต่างกันอย่างไร?", "q_group": "Product & Details"},
+            {"standard_question_th": "ใคร Spec/ ใครเลือก", "q_group": "Product & Details"},
+            {"standard_question_th": "ร้านที่ซื้อ", "q_group": "Product & Details"},
+            {"standard_question_th": "ปัจจัยการเลือกร้าน", "q_group": "Product & Details"},
+            {"standard_question_th": "ปัจจัยเลือกแบรนด์", "q_group": "Product & Details"},
+            {"standard_question_th": "ราคา (บาท/ถุง)", "q_group": "Product & Details"},
+            {"standard_question_th": "ปริมาณการซื้อต่อครั้ง", "q_group": "Product & Details"},
+        ],
+    },
+}
+
+BUSINESS_TYPES = tuple(QUESTION_BANK.keys())
+
+# =========================
+#   พจนานุกรมตัวเลือก (ชีต Dict)
+# =========================
+# ---- 1.1: ลิสต์ของ product แยก grey mortar rmc ta tg
+GREY_PRODUCTS = [
+    "01.Tiger","02.Rhino","03.Super","04.Tiger Plastering","06.Precast","11.Elephant Hybrid","20.Durable",
+    "TPI-TPI Loft M103  ปูนฉาบขัดมันสำเร็จรูป สูตรผง ผสมน้ำใช้ได้ทันที",
+    "TPI-TPI Loft Ready to used NP103 ผลิตภัณฑ์ฉาบขัดมันสำเร็จรูป สูตรพร้อมใช้",
+    "TPI-คอนกรีตแห้งทีพีไอ (Dry Crete)",
+    "TPI-ซีเมนต์แห้งเร็วพิเศษ ทีพีไอ (M680) (Water Plug Cement)",
+    "TPI-ทีพีไอ ออยล์ เวล ซีเมนต์",
+    "TPI-ปูนซีเมนต์ไฮดรอลิก ชนิดใช้งานทั่วไป ตราทีพีไอ 299",
+    "TPI-ปูนซีเมนต์ปอร์ตแลนด์ประเภท 1 ตราทีพีไอ (สีแดง)",
+    "TPI-ปูนซีเมนต์ปอร์ตแลนด์ประเภท 3 ตราทีพีไอ (สีดำ)",
+    "TPI-ปูนซีเมนต์ปอร์ตแลนด์ประเภท 5 ตราทีพีไอ (สีฟ้า)",
+    "TPI-ปูนซีเมนต์ผสม ตราทีพีไอ (สีเขียว)",
+    "TPI-ปูนทีพีไอ เขียวซูเปอร์",
+    "TPI-ปูนทีพีไอ M197/M199",
+    "TPI-ปูนทีพีไอ แดงซูเปอร์",
+    "Well Cement",
+    "บัวเขียว","บัวแดง โปรเวิร์ค","บัวแดง ไฮเทค","บัวแดง ไฮเทค เอ็กซ์ตร้า","บัวแดง งานเททั่วไป งานหล่อ",
+    "บัวฉลาม","บัวซูเปอร์","บัวดำ","บัวพลัส","บัวฟ้า",
+    "อินทรี ไพร์เมอร์","อินทรี ลาเท็กซ์","อินทรีเพชร","อินทรีเพชร CPM","อินทรีเพชร Easy Flow","อินทรีเพชร Quick Cast",
+    "อินทรีเพชร งานทางหลวง","อินทรีเพชรพลัส","อินทรีแดง","อินทรีซูเปอร์",
+    "อินทรีดำ High Early Strength","อินทรีดำ​","อินทรีดำงานหล่อ","อินทรีทอง","อินทรีปูนเขียว","อินทรีพ่น"
+
+]
+MORTAR_PRODUCTS = [
+    'Corner Bead Mortar-ปูนจับเซี๊ยม',' FSM-เสือมอร์ตาร์เทปรับพื้น','GPM-เสือมอร์ตาร์ฉาบทั่วไป',
+    'LMM-เสือมอร์ตาร์ก่อมวลเบา','LPM-เสือมอร์ตาร์ฉาบมวลเบา',
+    'MAM-เสือมอร์ตาร์ก่อทั่วไป',
+    'Mortar Easy-เสือมอร์ตาร์ก่อเท',
+    'Dry concrete-เสือมอร์ตาร์คอนกรีตแห้ง 240 KSC',
+    'TPI-TPI Loft – M103  ปูนฉาบขัดมันสำเร็จรูป สูตรผง ผสมน้ำใช้ได้ทันที',
+    'TPI-ซีเมนต์แห้งเร็วพิเศษ ทีพีไอ (M680) (Water Plug Cement)',
+    'TPI-ปูนเทปรับระดับชนิดไหลตัวดี Semi-Self  M410',
+    'TPI-ปูนเทปรับระดับสำเร็จรูป ทีพีไอ (M400)',
+    'TPI-ปูนเทปรับระดับสำเร็จรูป ทีพีไอ (M409)',
+    'TPI-ปูนก่อบล็อคมวลเบา ทีพีไอ',
+    'TPI-ปูนก่อสำเร็จรูป ทีพีไอ',
+    'TPI-ปูนฉาบบล็อคมวลเบา ทีพีไอ (M210)',
+    'TPI-ปูนฉาบผิวคอนกรีต ทีพีไอ (M100C)',
+    'TPI-ปูนฉาบละเอียดสำเร็จรูป ทีพีไอ (M100)',
+    'TPI-ปูนฉาบสำเร็จรูปทั่วไป ทีพีไอ (M200)',
+    'TPI-ปูนสำเร็จรูปสำหรับงานทนกรด (M250)',
+    'TPI-ปูนสำเร็จรูปสำหรับบล็อคมวลเบา (M220B) ชนิดไม่อบไอน้ำ',
+    'TPI-คอนกรีตแห้ง 240 KSC Cylinder (M402)',
+    'บัวมอร์ตาร์ ก่อทั่วไป',
+    'บัวมอร์ตาร์ ก่ออิฐมวลเบา',
+    'บัวมอร์ตาร์ ฉาบทั่วไป',
+    'บัวมอร์ตาร์ ฉาบอิฐมวลเบา',
+    'อินทรีมอร์ตาร์ ฉาบทั่วไป 11',
+    'อินทรีมอร์ตาร์ ฉาบละเอียด 12',
+    'อินทรีมอร์ตาร์ ฉาบมวลเบา 13',
+    'อินทรีมอร์ตาร์ ก่อทั่วไป 21',
+    'อินทรีมอร์ตาร์ ก่อมวลเบา 23',
+    'อินทรีมอร์ตาร์ เทปรับระดับพื้น 31',
+    'อินทรีมอร์ตาร์ 52 คอนกรีตแห้ง 240 KSC'
+
+]
+
+SKIM_PRODUCTS = [
+    "Mass Grey skim coat","Mass White skim coat",
+    "บัวมอร์ตาร์ สกิมโค้ท ปูนฉาบบาง แต่งผิว สีขาว","บัวมอร์ตาร์ สกิมโค้ท ปูนฉาบบาง ตกแต่งผิว สีเทา",
+    "ซูเปอร์ สกิมโค้ท ทีพีไอ ผิวแกร่ง M651 (SUPER SKIM COAT HARDENING)",
+    "ลูกดิ่ง สกิมโค้ท (สีขาว)","ลูกดิ่ง สกิมโค้ท (สีเทาอ่อน)","จระเข้ สกิมโค้ท สมูท",
+    "ลูกดิ่ง สกิมโค้ท (สีเทา)","ลูกดิ่ง ซุปเปอร์ สกิมโค้ท  (สีขาว)",
+    "ทีโอเอ 110 สกิมโค้ท สมูท เนื้อสีขาว","ทีโอเอ 110 สกิมโค้ท สมูท เนื้อสีเทา",
+    "ทีโอเอ สกิมโค้ท เนื้อสีขาว​","ทีโอเอ สกิมโค้ท เนื้อสีเทา","จระเข้ สกิมโค้ท สมูท เกเตอร์",
+    "LANKO สกิมโค้ท 110 สีเทา","ปูนฉาบผิวบาง Skim Coat TPI (M650F)",
+    "จระเข้ สกิมโค้ท แซนด์ เกเตอร์","LANKO สกิมโค้ท 110 สีขาว","จระเข้ สกิมโค้ท 102","จระเข้ สกิมโค้ท 102 เกเตอร์"
+]
+
+RMC_PRODUCTS = ['รถโม่ CPAC 210','รถโม่ CPAC 240', 'รถโม่ CPAC 280', 'รถโม่ CPAC 300',
+                'รถโม่ CPAC 320','รถโม่ SCG 210','รถโม่ SCG 240','รถโม่ SCG 280','รถโม่ SCG 300',
+                'รถโม่ SCG 320','รถโม่ อินทรีย์ 210','รถโม่ อินทรีย์ 240','รถโม่ อินทรีย์ 280','รถโม่ อินทรีย์ 300',
+                'รถโม่ อินทรีย์ 320','รถโม่ TPI 210','รถโม่ TPI 240','รถโม่ TPI 280','รถโม่ TPI 300','รถโม่ TPI 320'
+    ]
+
+TA_PRODUCTS = [
+    "Tile Adhesive Blue","Tile Adhesive Gold","Tile Adhesive Green","Tile Adhesive Orange","Tile Adhesive Pink",
+    "COTTO TA","บัวมอร์ตาร์ กาวซีเมนต์ สำหรับกระเบื้องขนาดใหญ่","กาวซีเมนต์ ทีโอเอ ซิลเวอร์ไทล์",
+    "บัวมอร์ตาร์ กาวซีเมนต์ สำหรับกระเบื้องทั่วไป","TPI-กาวซีเมนต์ ทีพีไอ (M500)",
+    "TPI-กาวซีเมนต์ชนิดแรงยึดเกาะสูง ทีพีไอ (M501)",
+    "TPI-ปูนกาวติดกระเบื้องขนาดใหญ่ สำหรับปูกระเบื้องสระว่ายน้ำ (M503)",
+    "TPI-กาวซีเมนต์ชนิดพิเศษ (M509)","กาวซีเมนต์ ทีโอเอ พรีเมียมไทล์","กาวซีเมนต์เดฟโก้ ทีทีบีพลัส",
+    "กาวซีเมนต์เดฟโก้ ซุปเปอร์ทีทีบี","กาวซีเมนต์เดฟโก้ แกรนิโต้ พลัส","กาวซีเมนต์เดฟโก้ พูล",
+    "กาวซีเมนต์ จระเข้ทอง","กาวซีเมนต์ ทีโอเอ โปรไทล์","กาวซีเมนต์ จระเข้สโตนเมท",
+    "กาวซีเมนต์ จระเข้เขียว","กาวซีเมนต์ จระเข้ฟ้า","กาวซีเมนต์ขาว จระเข้แดง","กาวซีเมนต์ จระเข้เอ็กซ์เพรส",
+    "กาวซีเมนต์ ทีโอเอ อีโคไทล์","กาวซีเมนต์ จระเข้เกรย์สโตนเมท","กาวซีเมนต์ ทีโอเอ ซุปเปอร์ไทล์",
+    "กาวซีเมนต์ จระเข้เอ็กซ์ตรีม","กาวซีเมนต์ขาว จระเข้ทอง","กาวซีเมนต์ จระเข้เงิน","กาวซีเมนต์ขาว จระเข้เงิน",
+    "กาวซีเมนต์ จระเข้แดง","กาวซีเมนต์ เวเบอร์ไทล์ เฟล็กซ์","กาวซีเมนต์เดฟโก้ เอซี-2",
+    "กาวซีเมนต์ เวเบอร์ไทล์ เกรส","กาวซีเมนต์ เวเบอร์ไทล์ วิส","กาวปูกระเบื้องพร้อมใช้ จระเข้ ทูฟิกซ์",
+    "กาวปูและยาแนวกระเบื้อง จระเข้ อีพ็อกซี่ พลัส","กาวซีเมนต์ เวเบอร์สโตน ฟิกซ์","กาวซีเมนต์ เวเบอร์ไทล์ ฟิกซ์",
+    "กาวซีเมนต์ จระเข้เหลือง","กาวซีเมนต์ จระเข้ทอง (สำหรับงานซ่อมแซม)",
+    "กาวซีเมนต์ เวเบอร์ไทล์ 2-อิน-1","กาวซีเมนต์ เวเบอร์ไทล์ เซ็ม","กาวซีเมนต์ เวเบอร์ไทล์ โนสเตน",
+    "กาวซีเมนต์ ชาละวัน","กาวซีเมนต์ จระเข้ทอง (สำหรับโมเสกแก้ว กระเบื้องแก้ว)","กาวซีเมนต์เดฟโก้ อัลตร้าเฟล็กซ์"
+]
+
+TG_PRODUCTS = [
+    "Tile Grout","กาวยาแนวอินทรี",
+    "TPI-Non-Shrink Grout",
+    "TPI-ปูนยาแนว",
+    "กาวยาแนวจระเข้",
+    "กาวยาแนวเวเบอร์","กาวยาแนวชาละวัน"
+]
+
+PAINT_PRODUCTS = ["TOA","Beger","Nippon paint","Jotun","JBP","Dulux","Krystal"]
+
+# ---- 1.4: รวมเป็น dict สำหรับชีต Dict (อ่านอย่างเดียว) ----
+DICT_DATA = MappingProxyType({k: tuple(v) for k, v in {
+    "GREY":   GREY_PRODUCTS,
+    "MORTAR": MORTAR_PRODUCTS,
+    "SKIM":   SKIM_PRODUCTS,
+    "TA":     TA_PRODUCTS,
+    "TG":     TG_PRODUCTS,
+    "RMC":    RMC_PRODUCTS,
+    "PAINT":  PAINT_PRODUCTS,
+}.items()})
+
+# เวอร์ชันของคลัง = hash ของเนื้อหา → ใช้เป็น key ของ cache (แก้คลังเมื่อไหร่ key เปลี่ยนเอง)
+BANK_VERSION = hashlib.sha1(
+    json.dumps([QUESTION_BANK, dict(DICT_DATA)], ensure_ascii=False, sort_keys=True).encode("utf-8")
+).hexdigest()[:12]
+
+
+# 📚 แปลง QUESTION_BANK -> sheets_data (โครงเดียวกับไฟล์ Excel เดิม)
+PRODUCT_SHEETS = {"Product List", "Product & Details"}
+
+def build_sheets_data_from_bank(bank_for_biz: dict) -> dict:
+    sheets = {}
+    for sheet_name, rows in (bank_for_biz or {}).items():
+        # ข้ามชีตที่ว่างเปล่า
+        if rows is None or (isinstance(rows, list) and len(rows) == 0):
+            continue
+
+        df = pd.DataFrame(rows)
+
+        # ถ้าเป็น list[str] จะได้คอลัมน์ชื่อ 0 มา -> แปลงให้ถูก
+        if "standard_question_th" not in df.columns:
+            if 0 in df.columns:  # เคส list[str]
+                df = pd.DataFrame({"standard_question_th": df[0].astype(str).str.strip()})
+            else:
+                # ไม่มีคำถามเลยก็ข้ามไป
+                if df.empty:
+                    continue
+                raise ValueError(f"{sheet_name}: missing 'standard_question_th'")
+
+        if "q_group" not in df.columns:
+            df["q_group"] = "Product & Details" if sheet_name in PRODUCT_SHEETS else sheet_name
+
+        df = df[["standard_question_th", "q_group"]].copy()
+        df["standard_question_th"] = df["standard_question_th"].astype(str).str.strip()
+        df["q_group"] = df["q_group"].astype(str).str.strip()
+
+        # ข้ามแถวที่คำถามว่าง
+        df = df[df["standard_question_th"] != ""]
+        if not df.empty:
+            sheets[sheet_name] = df
+
+    return sheets
+
+
+
+@lru_cache(maxsize=None)
+def _compiled_sheets_data(biz: str, bank_version: str):
+    return MappingProxyType(build_sheets_data_from_bank(QUESTION_BANK.get(biz, {})))
+
+
+def get_sheets_data(biz: str, bank_version: str = BANK_VERSION):
+    """
+    sheets_data ของ business type ที่ build ไว้แล้ว (cache ต่อ biz + bank version)
+    คืน mapping แบบอ่านอย่างเดียว และ DataFrame ถูกแชร์ข้าม session — ห้ามแก้ในที่ (ให้ .copy() ก่อน)
+    """
+    return _compiled_sheets_data(biz, bank_version)
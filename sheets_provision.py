@@ -0,0 +1,162 @@
+# ☁️ GOOGLE SHEETS — สร้าง spreadsheet ตรงผ่าน Sheets API (แทนการอัปโหลด survey_google_sheets.xlsx เอง)
+# ต่อหนึ่งไฟล์ใช้ 2 request: spreadsheets.create (ทุกชีต + หัวตาราง + freeze ในตัว) แล้ว batchUpdate ครั้งเดียวสำหรับ dropdown
+# ทดสอบแบบ offline ได้กับ fake_sheets_server.py (ตั้ง SHEETS_API_ENDPOINT=http://127.0.0.1:<port>/)
+import os
+from itertools import zip_longest
+
+from question_bank import DICT_DATA
+from survey_engine import DATA_END_ROW, ColumnPlan, category_runs, column_shards, shard_title
+
+SCOPES = ("https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive.file")
+SHEETS_API_ENDPOINT = os.environ.get("SHEETS_API_ENDPOINT") or None
+GOOGLE_SHEETS_MAX_COLUMNS = 18278        # คอลัมน์สูงสุดต่อชีต (ZZZ)
+GOOGLE_SHEETS_MAX_CELLS = 10_000_000     # เซลล์สูงสุดต่อ spreadsheet
+NUM_RETRIES = 5                          # googleapiclient backoff แบบ exponential เมื่อเจอ 429 / 5xx
+HTTP_TIMEOUT = 60
+
+DICTIONARY_SHEET_ID = 900000             # sheetId กำหนดเองตอน create จึงสร้าง batchUpdate ได้โดยไม่ต้องรอคำตอบ
+DICT_SHEET_ID = 900001
+
+
+def service_account_credentials(info: dict):
+    """credentials จาก service account (เช่น st.secrets["gcp_service_account"])"""
+    from google.oauth2 import service_account
+    return service_account.Credentials.from_service_account_info(info, scopes=list(SCOPES))
+
+
+def _cell(value) -> dict:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return {"userEnteredValue": {"numberValue": value}}
+    return {"userEnteredValue": {"stringValue": "" if value is None else str(value)}}
+
+
+def _sheet(sheet_id: int, title: str, rows, row_count: int, column_count: int) -> dict:
+    return {
+        "properties": {
+            "sheetId": sheet_id,
+            "title": title,
+            "gridProperties": {"rowCount": row_count, "columnCount": max(column_count, 1), "frozenRowCount": 1},
+        },
+        "data": [{"startRow": 0, "startColumn": 0, "rowData": [{"values": [_cell(v) for v in row]} for row in rows]}],
+    }
+
+
+def spreadsheet_body(plan: ColumnPlan, title: str, max_columns: int = GOOGLE_SHEETS_MAX_COLUMNS,
+                     data_end_row: int = DATA_END_ROW) -> dict:
+    """
+    body ของ spreadsheets.create — layout เดียวกับ survey_google_sheets.xlsx:
+    Responses (หัว 1 แถว, แบ่งชีตเมื่อเกิน max_columns) + DataDictionary + Dict (รายการ dropdown)
+    """
+    shards = column_shards(len(plan), max_columns)
+    sheets = [
+        _sheet(index, shard_title("Responses", index), [plan.labels[start:stop]], data_end_row, stop - start)
+        for index, (start, stop) in enumerate(shards)
+    ]
+    groups = plan.groups()
+    dictionary = [["column_name", "q_group", "question_text"]] + [[c, g, c] for c, g in zip(plan.labels, groups)]
+    sheets.append(_sheet(DICTIONARY_SHEET_ID, "DataDictionary", dictionary, len(dictionary), 3))
+    dict_rows = [list(DICT_DATA.keys())] + [list(row) for row in zip_longest(*DICT_DATA.values())]
+    sheets.append(_sheet(DICT_SHEET_ID, "Dict", dict_rows, len(dict_rows), len(DICT_DATA)))
+
+    cells = sum(s["properties"]["gridProperties"]["rowCount"] * s["properties"]["gridProperties"]["columnCount"]
+                for s in sheets)
+    if cells > GOOGLE_SHEETS_MAX_CELLS:
+        raise ValueError(f"{cells:,} cells เกินเพดาน Google Sheets ({GOOGLE_SHEETS_MAX_CELLS:,}) — ลด data_end_row หรือใช้ไฟล์แบบ long")
+    return {"properties": {"title": title}, "sheets": sheets}
+
+
+def validation_requests(plan: ColumnPlan, max_columns: int = GOOGLE_SHEETS_MAX_COLUMNS,
+                        data_end_row: int = DATA_END_ROW) -> list:
+    """setDataValidation หนึ่งอันต่อช่วงคอลัมน์ติดกันของหมวดเดียวกัน (ชี้ไปคอลัมน์ของหมวดในชีต Dict)"""
+    from openpyxl.utils import get_column_letter
+
+    sources = {}
+    for ci, (cat, items) in enumerate(DICT_DATA.items(), start=1):
+        if items:
+            col = get_column_letter(ci)
+            sources[cat] = f"='Dict'!${col}$2:${col}${len(items) + 1}"
+
+    requests = []
+    for index, (start, stop) in enumerate(column_shards(len(plan), max_columns)):
+        for cat, runs in category_runs(plan.categories[start:stop]).items():
+            if cat not in sources:
+                continue
+            rule = {
+                "condition": {"type": "ONE_OF_RANGE", "values": [{"userEnteredValue": sources[cat]}]},
+                "strict": False,
+                "showCustomUi": True,
+            }
+            for first, last in runs:
+                requests.append({"setDataValidation": {
+                    "range": {"sheetId": index, "startRowIndex": 1, "endRowIndex": data_end_row,
+                              "startColumnIndex": first, "endColumnIndex": last + 1},
+                    "rule": rule,
+                }})
+    return requests
+
+
+class SheetsClient:
+    """
+    Sheets (+ Drive สำหรับแชร์) ที่ใช้ httplib2.Http ตัวเดียว — ทุก request วิ่งบน keep-alive connection เดิม
+    ไม่ thread-safe: สร้างหนึ่งตัวต่อ thread / ต่อการกดปุ่ม
+    api_endpoint: เปลี่ยนปลายทาง (เช่น fake_sheets_server) — None = Google จริง
+    """
+
+    def __init__(self, credentials=None, api_endpoint: str | None = SHEETS_API_ENDPOINT,
+                 num_retries: int = NUM_RETRIES, timeout: int = HTTP_TIMEOUT):
+        try:
+            import httplib2
+            from googleapiclient.discovery import build
+        except ImportError:
+            raise RuntimeError("ต้องติดตั้ง google-api-python-client และ google-auth-httplib2 ก่อน (pip install -r requirements.txt)")
+
+        self.num_retries = num_retries
+        self.http = httplib2.Http(timeout=timeout)
+        if credentials is not None:
+            from google_auth_httplib2 import AuthorizedHttp
+            self.http = AuthorizedHttp(credentials, http=self.http)
+        self._client_options = {"api_endpoint": api_endpoint} if api_endpoint else None
+        self._build = build
+        self.sheets = self._service("sheets", "v4")
+        self._drive = None
+
+    def _service(self, name: str, version: str):
+        return self._build(name, version, http=self.http, client_options=self._client_options,
+                           cache_discovery=False, static_discovery=True)
+
+    @property
+    def drive(self):
+        if self._drive is None:
+            self._drive = self._service("drive", "v3")
+        return self._drive
+
+    def provision(self, plan: ColumnPlan, title: str, share_with=(), max_columns: int = GOOGLE_SHEETS_MAX_COLUMNS,
+                  data_end_row: int = DATA_END_ROW) -> dict:
+        """
+        สร้าง spreadsheet ของ plan -> {"spreadsheet_id", "url", "api_calls"}
+        share_with: อีเมลที่ให้สิทธิ์แก้ไข (จำเป็นเมื่อใช้ service account ไม่งั้นไฟล์อยู่ใน Drive ของ service account)
+        หมายเหตุ: create ถูก retry เมื่อเจอ 5xx ด้วย จึงอาจได้ไฟล์ซ้ำในกรณีที่ Google สร้างสำเร็จแต่ตอบ error
+        """
+        body = spreadsheet_body(plan, title, max_columns, data_end_row)
+        created = self.sheets.spreadsheets().create(
+            body=body, fields="spreadsheetId,spreadsheetUrl",
+        ).execute(num_retries=self.num_retries)
+        spreadsheet_id = created["spreadsheetId"]
+        calls = 1
+
+        requests = validation_requests(plan, max_columns, data_end_row)
+        if requests:
+            self.sheets.spreadsheets().batchUpdate(
+                spreadsheetId=spreadsheet_id, body={"requests": requests}, fields="spreadsheetId",
+            ).execute(num_retries=self.num_retries)
+            calls += 1
+
+        for email in share_with:
+            self.drive.permissions().create(
+                fileId=spreadsheet_id, body={"type": "user", "role": "writer", "emailAddress": email},
+                sendNotificationEmail=False, fields="id",
+            ).execute(num_retries=self.num_retries)
+            calls += 1
+
+        url = created.get("spreadsheetUrl") or f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}/edit"
+        return {"spreadsheet_id": spreadsheet_id, "url": url, "api_calls": calls}
@@ -0,0 +1,161 @@
+# 📊 ANALYSIS — แปลงคอลัมน์ cross-product ("ก่อ-Grey-ราคาหน้าร้าน#2") เป็นตาราง long แล้วสรุปราคา / สต็อก / ส่วนแบ่งยี่ห้อ
+# ทุกขั้นเป็น vectorized: แยก label ครั้งเดียวต่อ label ที่ไม่ซ้ำ, melt ด้วย numpy, สรุปด้วย groupby
+#
+# ใช้งาน:
+#   python survey_analysis.py --store survey_store/ --out-dir analysis/ [--brands normalized.parquet]
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from question_bank import BUSINESS_TYPES, get_sheets_data
+from survey_engine import BRAND_KEYS
+from survey_ingest import PRODUCT_GROUP, load_answers, parse_labels
+
+# detail -> measure ที่เป็นตัวเลข (ชื่อ detail ตามคลังของแต่ละ business type)
+DETAIL_MEASURES = {
+    "ราคาหน้าร้าน": "price_retail",
+    "ราคาทุน": "price_cost",
+    "ราคา (บาท/ถุง)": "price",
+    "สต็อก": "stock",
+    "ปริมาณการซื้อต่อครั้ง": "purchase_qty",
+}
+# detail ที่คำตอบเป็นยี่ห้อ — เทียบทั้งชื่อ ("ปัจจัยเลือกแบรนด์" มีคำว่าแบรนด์แต่ไม่ใช่คำตอบยี่ห้อ)
+BRAND_DETAILS = frozenset(BRAND_KEYS)
+PRODUCT_KEYS = ["business_type", "source_file", "respondent", "product", "instance"]
+
+
+def wide_to_long(wide: pd.DataFrame, groups=None, source_file: str = "") -> pd.DataFrame:
+    """
+    ตารางกว้าง (หนึ่งแถวต่อผู้ตอบ, หัวคอลัมน์ = label) -> long แบบเดียวกับ survey_ingest.load_answers
+    groups: q_group ของแต่ละคอลัมน์ (ไม่ใส่ = เดาจากรูป label: มี product-detail ที่รู้จัก = Product & Details)
+    """
+    labels = [str(c) for c in wide.columns]
+    if groups is None:
+        guessed = parse_labels(labels, [PRODUCT_GROUP] * len(labels))
+        groups = np.where(guessed["detail"].isin(_bank_details()), PRODUCT_GROUP, "N/A")
+    columns = parse_labels(labels, groups)
+
+    values = wide.to_numpy(dtype=object)
+    n_rows, n_cols = values.shape
+    flat = values.ravel()  # row-major: ผู้ตอบ r คอลัมน์ c อยู่ที่ r * n_cols + c
+    keep = ~pd.isna(flat) & (flat != "")
+    index = np.flatnonzero(keep)
+    col = index % n_cols
+    answers = pd.DataFrame({
+        "source_file": source_file,
+        "respondent": (index // n_cols + 1).astype(np.int32),
+        "column_index": col.astype(np.int32),
+    })
+    for name in ("q_group", "label", "base_question", "product", "detail"):
+        answers[name] = pd.Categorical(columns[name].to_numpy()[col])
+    answers["instance"] = columns["instance"].array.take(col)
+    answers["value"] = pd.array([str(v) for v in flat[index]], dtype="string")
+    return answers
+
+
+def _bank_details() -> set:
+    details = set()
+    for biz in BUSINESS_TYPES:
+        sheets_data = get_sheets_data(biz)
+        if "Product & Details" in sheets_data:
+            details.update(sheets_data["Product & Details"]["standard_question_th"])
+    return details
+
+
+def infer_business_types(answers: pd.DataFrame) -> pd.Series:
+    """
+    business type ของแต่ละไฟล์ = biz ที่คำถามในคลัง (รวม product-detail) ครอบคลุมคำถามของไฟล์มากที่สุด
+    (ไฟล์ที่ส่งกลับมาไม่มี business type ติดมา) -> Series: source_file -> business type
+    """
+    per_file = answers[["source_file", "base_question"]].drop_duplicates()
+    per_file = per_file.astype({"source_file": "string", "base_question": "string"})
+    coverage = {}
+    for biz in BUSINESS_TYPES:
+        sheets_data = get_sheets_data(biz)
+        known = set()
+        for name, df in sheets_data.items():
+            if name not in ("Product List", "Product & Details"):
+                known.update(df["standard_question_th"])
+        if "Product List" in sheets_data and "Product & Details" in sheets_data:
+            products = sheets_data["Product List"]["standard_question_th"].to_numpy(dtype=object)
+            details = sheets_data["Product & Details"]["standard_question_th"].to_numpy(dtype=object)
+            known.update((products[:, None] + "-" + details[None, :]).ravel())
+        coverage[biz] = per_file["base_question"].isin(known).groupby(per_file["source_file"]).mean()
+    return pd.DataFrame(coverage).idxmax(axis=1).rename("business_type")
+
+
+def product_answers(answers: pd.DataFrame, business_types: pd.Series | None = None) -> pd.DataFrame:
+    """
+    เฉพาะคำตอบ Product & Details -> long: business_type, source_file, respondent, product, instance, detail, value
+    + measure / number (ตัวเลขของ detail ที่เป็นราคา/สต็อก) และ is_brand
+    """
+    if business_types is None:
+        business_types = infer_business_types(answers)
+    long = answers.loc[answers["q_group"] == PRODUCT_GROUP,
+                       ["source_file", "respondent", "product", "instance", "detail", "value"]
+                       + [c for c in ("brand",) if c in answers.columns]].copy()
+    long.insert(0, "business_type", long["source_file"].astype("category").map(business_types).astype("category"))
+
+    details = long["detail"].astype("category")  # map บน categorical = คำนวณต่อ detail ที่ไม่ซ้ำ
+    long["measure"] = details.map(DETAIL_MEASURES).astype("category")
+    long["is_brand"] = details.isin(BRAND_DETAILS).to_numpy()
+    has_measure = long["measure"].notna().to_numpy()
+    number = long["value"][has_measure].astype("string").str.replace(",", "", regex=False).str.strip()
+    long["number"] = np.nan
+    long.loc[has_measure, "number"] = pd.to_numeric(number, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    return long.reset_index(drop=True)
+
+
+def product_table(long: pd.DataFrame) -> pd.DataFrame:
+    """หนึ่งแถวต่อ (ไฟล์, ผู้ตอบ, สินค้า, ลำดับ) — detail เป็นคอลัมน์ (pivot แบบ vectorized)"""
+    table = long.pivot_table(index=PRODUCT_KEYS, columns="detail", values="value", aggfunc="first", observed=True)
+    table.columns.name = None
+    return table.reset_index()
+
+
+def summarize(long: pd.DataFrame) -> dict:
+    """
+    สรุปต่อ business type x สินค้า:
+      measures: median / mean / count ของแต่ละ measure (ราคา, สต็อก, ...)
+      brand_share: สัดส่วนยี่ห้อ (ใช้คอลัมน์ brand ที่ normalize แล้วถ้ามี ไม่งั้นใช้ค่าที่กรอก)
+    """
+    numeric = long[long["number"].notna()]
+    measures = (numeric.groupby(["business_type", "product", "measure"], observed=True)["number"]
+                .agg(["median", "mean", "count"]).reset_index())
+
+    brands = long[long["is_brand"]]
+    brand_col = "brand" if "brand" in brands.columns else "value"
+    brands = brands.assign(brand=brands[brand_col].astype("string").fillna(brands["value"].astype("string")))
+    counts = brands.groupby(["business_type", "product", "brand"], observed=True).size().rename("answers")
+    share = (counts / counts.groupby(level=["business_type", "product"], observed=True).transform("sum")).rename("share")
+    brand_share = pd.concat([counts, share.round(4)], axis=1).reset_index()
+    brand_share = brand_share.sort_values(["business_type", "product", "answers"], ascending=[True, True, False])
+
+    respondents = (long[["business_type", "product", "source_file", "respondent"]].drop_duplicates()
+                   .groupby(["business_type", "product"], observed=True).size().rename("respondents").reset_index())
+    return {"measures": measures, "brand_share": brand_share.reset_index(drop=True), "respondents": respondents}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="ตาราง long + สรุปราคา/สต็อก/ส่วนแบ่งยี่ห้อ ของคอลัมน์ cross-product")
+    parser.add_argument("-s", "--store", default="survey_store", help="Parquet store จาก survey_ingest.py")
+    parser.add_argument("-b", "--brands", default=None, help="ผลจาก brand_normalizer.py -o (ใช้ยี่ห้อที่ normalize แล้ว)")
+    parser.add_argument("-o", "--out-dir", default="analysis", help="โฟลเดอร์ผลลัพธ์")
+    args = parser.parse_args(argv)
+
+    answers = pd.read_parquet(args.brands) if args.brands else load_answers(args.store)
+    long = product_answers(answers)
+    os.makedirs(args.out_dir, exist_ok=True)
+    long.to_parquet(os.path.join(args.out_dir, "product_answers.parquet"), index=False)
+    for name, frame in summarize(long).items():
+        frame.to_csv(os.path.join(args.out_dir, f"{name}.csv"), index=False, encoding="utf-8-sig")
+    print(f"📊 {len(long)} product answers, {long['product'].nunique()} products, "
+          f"{long['business_type'].nunique()} business types -> {args.out_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
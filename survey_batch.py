@@ -0,0 +1,140 @@
+# 🏭 BATCH CLI — สร้างไฟล์แบบสอบถามหลายชุดจาก manifest (JSONL / YAML) ด้วย process pool
+#
+# ตัวอย่าง manifest (JSONL หนึ่งบรรทัดต่อหนึ่งชุด):
+#   {"name": "north-subdealer", "business_type": "Subdealer & Bag transformer",
+#    "questions": ["ชื่อ", {"question": "เบอร์โทร", "quantity": 2}],
+#    "products": "all", "details": ["ยี่ห้อ", "ราคาหน้าร้าน"]}
+#
+# ใช้งาน:
+#   python survey_batch.py manifest.jsonl -o out/ --workers 8 --artifacts excel,google_sheets
+#   python survey_batch.py manifest.jsonl -o out/ --bundle        # หนึ่ง zip ต่อชุดแทนโฟลเดอร์
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from artifact_cache import ArtifactCache
+from survey_engine import (
+    ARTIFACTS, BUILDERS, DEFAULT_ARTIFACTS, LazyArtifacts, SurveyConfig, build_artifacts, build_bundle,
+    config_fingerprint, plan_from_config,
+)
+
+
+def load_manifest(path: str) -> list:
+    """อ่าน manifest: .jsonl (หนึ่ง config ต่อบรรทัด) หรือ .yaml/.yml (list หรือ {"surveys": [...]})"""
+    with open(path, encoding="utf-8") as f:
+        if path.lower().endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise SystemExit("ต้องติดตั้ง PyYAML ก่อนใช้ manifest แบบ YAML (pip install pyyaml)")
+            data = yaml.safe_load(f) or []
+            if isinstance(data, dict):
+                data = data.get("surveys", [])
+            return list(data)
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def safe_name(text: str) -> str:
+    return re.sub(r'[\\/:*?"<>|\s]+', "_", text).strip("_") or "survey"
+
+
+def output_name(index: int, config: SurveyConfig) -> str:
+    return safe_name(config.name or f"{index:04d}_{config.business_type}")
+
+
+def build_one(index: int, raw: dict, out_dir: str, kinds: tuple, cache_dir: str | None = None) -> dict:
+    """สร้างไฟล์ของ config หนึ่งชุด (รันใน worker process); มี cache_dir = ใช้ไฟล์ที่เคยสร้างจาก selection เดียวกัน"""
+    started = time.perf_counter()
+    config = SurveyConfig.from_dict(raw)
+    name = output_name(index, config)
+    target = os.path.join(out_dir, name)
+    os.makedirs(target, exist_ok=True)
+
+    plan = plan_from_config(config)
+    if cache_dir:
+        cache, fingerprint = ArtifactCache(cache_dir), config_fingerprint(config)
+        artifacts = {kind: cache.get_or_build(fingerprint, kind, lambda kind=kind: BUILDERS[kind](plan))
+                     for kind in kinds}
+    else:
+        artifacts = build_artifacts(plan, kinds)
+    files = []
+    for kind, data in artifacts.items():
+        path = os.path.join(target, ARTIFACTS[kind][0])
+        with open(path, "wb") as f:
+            f.write(data)
+        files.append(path)
+    return {"index": index, "name": name, "columns": len(plan), "files": files,
+            "seconds": round(time.perf_counter() - started, 3)}
+
+
+def bundle_one(index: int, raw: dict, out_dir: str, kinds: tuple, pool, cache_dir: str | None = None) -> dict:
+    """
+    --bundle: plan สร้างใน process หลัก (รันใน thread) ไฟล์ของชุดนี้สร้างพร้อมกันใน pool ที่ใช้ร่วมทุกชุด
+    ผ่าน build_bundle แล้วเขียนเป็น <name>.zip ไฟล์เดียว
+    """
+    started = time.perf_counter()
+    config = SurveyConfig.from_dict(raw)
+    name = output_name(index, config)
+    plan = plan_from_config(config)
+    cache = ArtifactCache(cache_dir) if cache_dir else None
+    artifacts = LazyArtifacts(plan, config_fingerprint(config), cache=cache)
+    try:
+        data = build_bundle(plan, kinds, pool, artifacts=artifacts)
+    finally:
+        artifacts.close()
+    path = os.path.join(out_dir, f"{name}.zip")
+    with open(path, "wb") as f:
+        f.write(data)
+    return {"index": index, "name": name, "columns": len(plan), "files": [path],
+            "seconds": round(time.perf_counter() - started, 3)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="สร้าง survey_template.xlsx / PDF / Excel แนวตั้ง / Google Sheets จาก manifest")
+    parser.add_argument("manifest", help="ไฟล์ .jsonl หรือ .yaml ของ survey configs")
+    parser.add_argument("-o", "--out-dir", default="survey_out", help="โฟลเดอร์ผลลัพธ์ (หนึ่งโฟลเดอร์ย่อยต่อชุด)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="จำนวน process")
+    parser.add_argument("-a", "--artifacts", default=",".join(DEFAULT_ARTIFACTS),
+                        help=f"artifact ที่ต้องการ คั่นด้วย comma ({', '.join(ARTIFACTS)})")
+    parser.add_argument("--cache-dir", default=None,
+                        help="โฟลเดอร์ cache ไฟล์ตาม fingerprint ของ selection (ใช้ซ้ำข้ามรอบได้)")
+    parser.add_argument("--bundle", action="store_true", help="หนึ่งไฟล์ .zip ต่อชุด (แทนโฟลเดอร์ของไฟล์แยก)")
+    args = parser.parse_args(argv)
+
+    kinds = tuple(k.strip() for k in args.artifacts.split(",") if k.strip())
+    unknown = set(kinds) - set(ARTIFACTS)
+    if unknown:
+        parser.error(f"unknown artifact(s): {', '.join(sorted(unknown))}")
+
+    configs = load_manifest(args.manifest)
+    os.makedirs(args.out_dir, exist_ok=True)
+    started = time.perf_counter()
+    failed = 0
+
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool, ThreadPoolExecutor(
+            max_workers=max(1, args.workers)) as threads:
+        if args.bundle:  # งานย่อยต่อไฟล์ลง pool เดียวกัน: ชุดเดียวก็ยังสร้างไฟล์ของมันพร้อมกัน
+            futures = {threads.submit(bundle_one, i, raw, args.out_dir, kinds, pool, args.cache_dir): i
+                       for i, raw in enumerate(configs)}
+        else:
+            futures = {pool.submit(build_one, i, raw, args.out_dir, kinds, args.cache_dir): i
+                       for i, raw in enumerate(configs)}
+        for fut in as_completed(futures):
+            try:
+                res = fut.result()
+                print(f"✅ [{res['index']}] {res['name']}: {res['columns']} columns, "
+                      f"{len(res['files'])} files in {res['seconds']}s")
+            except Exception as e:
+                failed += 1
+                print(f"❌ [{futures[fut]}] {type(e).__name__}: {e}", file=sys.stderr)
+
+    print(f"🏁 {len(configs) - failed}/{len(configs)} surveys in {time.perf_counter() - started:.1f}s -> {args.out_dir}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,790 @@
+# ⚙️ SURVEY ENGINE — สร้างไฟล์ Excel / PDF จาก selection โดยไม่ต้องพึ่ง Streamlit
+# ใช้ได้ทั้งจาก stline.py (ปุ่ม export) และ survey_batch.py (CLI)
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import weakref
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from io import BytesIO
+from itertools import zip_longest
+
+import numpy as np
+import pandas as pd
+
+from qgroup_matcher import NO_GROUP, QGroupMatcher
+from question_bank import BANK_VERSION, BUSINESS_TYPES, DICT_DATA, get_sheets_data
+from survey_pdf import FONT_PATH, register_font, render_pdf
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# ชื่อ artifact -> (ชื่อไฟล์, mime)
+ARTIFACTS = {
+    "excel": ("survey_template.xlsx", XLSX_MIME),
+    "pdf": ("survey_questions_structured.pdf", "application/pdf"),
+    "vertical": ("survey_template_vertical.xlsx", XLSX_MIME),
+    "google_sheets": ("survey_google_sheets.xlsx", XLSX_MIME),
+    "long": ("survey_template_long.xlsx", XLSX_MIME),
+}
+DEFAULT_ARTIFACTS = ("excel", "pdf", "vertical", "google_sheets")
+BUNDLE = ("survey_bundle.zip", "application/zip")  # ทุกไฟล์ใน zip เดียว (ปุ่ม "ดาวน์โหลดทั้งหมด")
+
+# ✅ ลำดับ group ที่ต้องการ
+PREFERRED_QGROUP_ORDER = [
+    "BUSINESS_TYPE",
+    "Respondent Profile",
+    "Customer & Market",
+    "Business & Strategy",
+    "Pain Points & Needs",
+    "Product & Process",
+    "Product & Details",
+    "Special Topic"
+]
+
+BRAND_KEYS = ("ยี่ห้อ", "ยี่ห้อ/รุ่น", "รุ่น", "แบรนด์")
+HEADER_ROW = 3
+DATA_START_ROW = HEADER_ROW + 1  # = 4
+DATA_END_ROW = int(os.environ.get("SURVEY_DATA_END_ROW", 100))  # แถวสุดท้ายที่มี dropdown (ปรับได้ ไม่เพิ่มขนาดไฟล์)
+EXCEL_MAX_COLUMNS = 16384        # จำนวนคอลัมน์สูงสุดต่อชีตของ Excel (XFD)
+ARTIFACT_FORMAT = 1              # เพิ่มเมื่อหน้าตาไฟล์ที่สร้างเปลี่ยน — fingerprint เปลี่ยน, cache เก่าไม่ถูกใช้
+SPOOL_MAX_BYTES = int(os.environ.get("SURVEY_SPOOL_MAX_BYTES", 1024 * 1024))  # artifact ที่ใหญ่กว่านี้พักในไฟล์ชั่วคราว
+
+
+# 🌟 FUZZY MATCH (สร้าง matcher ครั้งเดียวต่อ business type ต่อ process, แชร์ข้าม rerun และ session)
+# 🏷️ หมวด dropdown ของคอลัมน์ — keyword เรียงตามลำดับความสำคัญ (หมวดแรกที่เจอชนะ เหมือน if-chain เดิม)
+CATEGORY_KEYWORDS = (
+    ("TG", ("ยาแนว", " tile grout", "-tg", "mortar-tg", " tg-")),
+    ("TA", ("กาวซีเมนต์", "tile adhesive", "-ta", "mortar-ta", " ta-")),
+    ("SKIM", ("skim", "สกิม")),
+    ("PAINT", ("paint", "สี-")),
+    ("RMC", ("rmc", "ready mix", "ready-mix", "คอนกรีตผสมเสร็จ")),
+    ("MORTAR", ("mortar", "มอร์ตาร์", "lightweight", "-lw")),
+    ("GREY", ("grey", "เกรย์", "ปูนผง", "cement")),
+)
+# regex เดียวทั้งชุด: lookahead ให้ได้ทุกตำแหน่งที่ keyword เริ่ม (ไม่ถูก match อื่นกินทับ)
+# ตำแหน่งเดียวกัน alternation ลองหมวดตามลำดับ จึงได้หมวดที่สำคัญสุดของตำแหน่งนั้น
+_CATEGORY_RE = re.compile("(?=" + "|".join(
+    f"(?P<{cat}>" + "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True)) + ")"
+    for cat, keywords in CATEGORY_KEYWORDS
+) + ")")
+_CATEGORY_RANK = {cat: rank for rank, (cat, _) in enumerate(CATEGORY_KEYWORDS)}
+_BRAND_RE = re.compile("|".join(re.escape(k) for k in BRAND_KEYS))
+
+
+@lru_cache(maxsize=65536)
+def category_of_product(label: str) -> str | None:
+    """หมวดของสินค้า/คอลัมน์ (GREY, MORTAR, ...) หรือ None — regex ที่ compile ไว้ครั้งเดียว + cache ต่อข้อความ"""
+    found = {m.lastgroup for m in _CATEGORY_RE.finditer(str(label).lower())}
+    return min(found, key=_CATEGORY_RANK.__getitem__) if found else None
+
+
+@lru_cache(maxsize=65536)
+def dropdown_category(base_question: str) -> str | None:
+    """หมวด dropdown ของคอลัมน์: เฉพาะคอลัมน์ยี่ห้อ/รุ่น/แบรนด์ ที่จัดหมวดสินค้าได้"""
+    if not _BRAND_RE.search(base_question):
+        return None
+    return category_of_product(base_question)
+
+
+@lru_cache(maxsize=None)
+def get_q_group_matcher(biz: str, all_business_types: bool = False, bank_version: str = BANK_VERSION) -> QGroupMatcher:
+    names = [biz] + ([b for b in BUSINESS_TYPES if b != biz] if all_business_types else [])
+    return QGroupMatcher.from_sheets_data(*(get_sheets_data(b, bank_version) for b in names))
+
+
+# 🔐 ป้องกัน duplicate column names — หนึ่ง allocator ต่อการ export หนึ่งครั้ง (ไม่แชร์ข้าม session/thread)
+class LabelAllocator:
+    """
+    ตั้งชื่อคอลัมน์ไม่ซ้ำ: base#i เมื่อ qty > 1 และถ้าชนก็ต่อท้าย #2, #3, ...
+    จำเลขถัดไปของแต่ละชื่อไว้ จึงไม่ต้องไล่ probe ใหม่ตั้งแต่ #2 ทุกครั้ง (O(1) ต่อ label โดยเฉลี่ย)
+    """
+
+    def __init__(self):
+        self._seen = set()
+        self._next_suffix = {}
+        self.collisions = 0  # จำนวนครั้งที่ต้องต่อท้าย #n (0 = ทุก label เป็นชื่อตรงตัว)
+
+    def __len__(self):
+        return len(self._seen)
+
+    def reserve(self, labels):
+        """จองชื่อที่ยกมาจาก plan ก่อนหน้า (ชื่อที่ชนกับที่มีอยู่แล้วนับเป็น collision)"""
+        before = len(self._seen)
+        self._seen.update(labels)
+        self.collisions += len(labels) - (len(self._seen) - before)
+
+    def __call__(self, base, i, qty):
+        raw = f"{base}#{i}" if qty > 1 else base
+        label = raw
+        if label in self._seen:
+            self.collisions += 1
+            count = self._next_suffix.get(raw, 2)
+            label = f"{raw}#{count}"
+            while label in self._seen:
+                count += 1
+                label = f"{raw}#{count}"
+            self._next_suffix[raw] = count + 1
+        self._seen.add(label)
+        return label
+
+
+# =========================
+#   SELECTION -> COLUMN PLAN
+# =========================
+CATEGORIES = tuple(DICT_DATA.keys())  # หมวด dropdown (GREY, MORTAR, ...) — index = category code
+NO_CODE = -1                          # ไม่มี product / detail / หมวด
+_CATEGORY_CODES = {cat: code for code, cat in enumerate(CATEGORIES)}
+
+
+class ColumnPlan:
+    """
+    plan ของคอลัมน์ทั้งหมดแบบ array: หนึ่งตำแหน่งต่อหนึ่งคอลัมน์ ใช้ร่วมกันทุก writer (ไม่ copy เป็น DataFrame)
+    ข้อความที่ซ้ำกัน (group, คำถามตั้งต้น, product, detail) เก็บครั้งเดียวใน tuple แล้วอ้างด้วยรหัส int
+    labels     = ชื่อคอลัมน์ (ไม่ซ้ำ) = แถวคำถามในหัวตาราง
+    instance   = ลำดับซ้ำของคำถาม/สินค้า (1..qty)
+    categories = รหัสหมวด dropdown ใน CATEGORIES (NO_CODE = ไม่มี dropdown)
+    segments   = ช่วงคอลัมน์ [start, stop) ของแต่ละรายการที่เลือก (คำถามหนึ่งข้อ / สินค้าหนึ่งตัว) — ใช้ patch plan ครั้งถัดไป
+    collisions = จำนวน label ที่ต้องต่อท้าย #n เพราะชื่อชน
+    """
+
+    __slots__ = ("labels", "group_names", "group_codes", "base_names", "base_codes", "product_names",
+                 "product_codes", "detail_names", "detail_codes", "instances", "categories", "segments", "collisions")
+
+    def __init__(self, labels, group_names, group_codes, base_names, base_codes, product_names, product_codes,
+                 detail_names, detail_codes, instances, categories, segments=None, collisions=0):
+        self.labels = labels
+        self.group_names = group_names
+        self.group_codes = group_codes
+        self.base_names = base_names
+        self.base_codes = base_codes
+        self.product_names = product_names
+        self.product_codes = product_codes
+        self.detail_names = detail_names
+        self.detail_codes = detail_codes
+        self.instances = instances
+        self.categories = categories
+        self.segments = segments or {}
+        self.collisions = collisions
+
+    def __len__(self):
+        return len(self.labels)
+
+    @property
+    def columns(self):
+        return self.labels
+
+    def groups(self, start: int = 0, stop: int | None = None) -> list:
+        names = self.group_names
+        return [names[c] for c in self.group_codes[start:stop].tolist()]
+
+    def rows(self, start: int = 0, stop: int | None = None):
+        """(group, label, answer) ทีละคอลัมน์ — แถวของ PDF / Excel แนวตั้ง"""
+        return zip(self.groups(start, stop), self.labels[start:stop], [""] * len(self.labels[start:stop]))
+
+    def category(self, index: int) -> str | None:
+        code = int(self.categories[index])
+        return None if code == NO_CODE else CATEGORIES[code]
+
+
+class _PlanBuilder:
+    """สะสมคอลัมน์แล้วแปลงเป็น ColumnPlan (intern ข้อความซ้ำเป็นรหัส)"""
+
+    _POOLS = ("group", "base", "product", "detail")
+
+    def __init__(self, previous: ColumnPlan | None = None):
+        self.labels = []
+        self.segments = {}
+        self._pools = {name: {} for name in self._POOLS}
+        self._codes = {name: [] for name in self._POOLS + ("instance", "category")}
+        if previous is not None:
+            # เริ่มจาก pool ของ plan ก่อนหน้า — รหัสในช่วงที่ยกมา (copy_from) ใช้ต่อได้โดยไม่ต้องแปลง
+            for name in self._POOLS:
+                self._pools[name] = {value: code for code, value in enumerate(getattr(previous, f"{name}_names"))}
+
+    def _intern(self, pool: str, value) -> int:
+        if value is None:
+            return NO_CODE
+        return self._pools[pool].setdefault(value, len(self._pools[pool]))
+
+    def add(self, group, label, base, instance, product=None, detail=None):
+        self.labels.append(label)
+        codes = self._codes
+        codes["group"].append(self._intern("group", group))
+        codes["base"].append(self._intern("base", base))
+        codes["product"].append(self._intern("product", product))
+        codes["detail"].append(self._intern("detail", detail))
+        codes["instance"].append(instance)
+        codes["category"].append(_CATEGORY_CODES.get(dropdown_category(base), NO_CODE))
+
+    def copy_from(self, previous: ColumnPlan, start: int, stop: int):
+        """ยกคอลัมน์ [start, stop) ของ plan ก่อนหน้ามาทั้งช่วง (ต้องสร้าง builder ด้วย previous ตัวเดียวกัน)"""
+        self.labels.extend(previous.labels[start:stop])
+        for name in self._POOLS:
+            self._codes[name].extend(getattr(previous, f"{name}_codes")[start:stop].tolist())
+        self._codes["instance"].extend(previous.instances[start:stop].tolist())
+        self._codes["category"].extend(previous.categories[start:stop].tolist())
+
+    def build(self, collisions: int = 0) -> ColumnPlan:
+        names = {pool: tuple(values) for pool, values in self._pools.items()}
+        codes = self._codes
+        return ColumnPlan(
+            labels=self.labels,
+            group_names=names["group"], group_codes=np.asarray(codes["group"], dtype=np.int32),
+            base_names=names["base"], base_codes=np.asarray(codes["base"], dtype=np.int32),
+            product_names=names["product"], product_codes=np.asarray(codes["product"], dtype=np.int32),
+            detail_names=names["detail"], detail_codes=np.asarray(codes["detail"], dtype=np.int32),
+            instances=np.asarray(codes["instance"], dtype=np.int32),
+            categories=np.asarray(codes["category"], dtype=np.int8),
+            segments=self.segments, collisions=collisions,
+        )
+
+
+@dataclass
+class SurveyConfig:
+    """
+    selection ของแบบสอบถามหนึ่งชุด (โครงเดียวกับที่หน้า UI เก็บไว้)
+    questions = [{"Question", "Quantity", "Group"}], products = [{"name", "qty"}], details = [str]
+    """
+    business_type: str
+    questions: list = field(default_factory=list)
+    products: list = field(default_factory=list)
+    details: list = field(default_factory=list)
+    name: str = ""
+    search_all_business_types: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SurveyConfig":
+        """
+        แปลง config จาก manifest (JSONL/YAML) — ใช้คีย์ตัวเล็กได้ และ Group ว่าง = หาจากคลังให้
+        questions: ["ชื่อ", {"question": "อายุ", "quantity": 2}, ...]
+        products:  "all" | ["ก่อ-Grey", {"name": "ฉาบ-Grey", "qty": 2}, ...]
+        details:   "all" | ["ยี่ห้อ", "ราคาหน้าร้าน", ...]  (ใส่คำถามเองได้)
+        """
+        biz = data.get("business_type") or data.get("biz")
+        if biz not in BUSINESS_TYPES:
+            raise ValueError(f"unknown business_type: {biz!r}")
+        sheets_data = get_sheets_data(biz)
+        bank_groups = {}
+        for sheet_name, df in sheets_data.items():
+            if sheet_name in ("Product List", "Product & Details"):
+                continue
+            for q, g in zip(df["standard_question_th"], df["q_group"]):
+                bank_groups.setdefault(q, g)
+
+        questions = []
+        for q in data.get("questions") or []:
+            if isinstance(q, str):
+                q = {"question": q}
+            text = str(q.get("question", q.get("Question", ""))).strip()
+            if not text:
+                continue
+            questions.append({
+                "Question": text,
+                "Quantity": int(q.get("quantity", q.get("Quantity", 1))),
+                "Group": q.get("group", q.get("Group")) or bank_groups.get(text, NO_GROUP),
+            })
+
+        is_cross = "Product List" in sheets_data and "Product & Details" in sheets_data
+        products, details = [], []
+        if is_cross:
+            raw_products = data.get("products") or []
+            if raw_products == "all":
+                raw_products = sheets_data["Product List"]["standard_question_th"].tolist()
+            for p in raw_products:
+                if isinstance(p, str):
+                    p = {"name": p}
+                products.append({"name": str(p["name"]).strip(), "qty": int(p.get("qty", p.get("quantity", 1)))})
+            raw_details = data.get("details") or []
+            if raw_details == "all":
+                raw_details = sheets_data["Product & Details"]["standard_question_th"].tolist()
+            details = [str(d).strip() for d in raw_details if str(d).strip()]
+
+        return cls(
+            business_type=biz,
+            questions=questions,
+            products=products,
+            details=details,
+            name=str(data.get("name", "")),
+            search_all_business_types=bool(data.get("search_all_business_types", False)),
+        )
+
+
+def build_column_plan(selected_questions, selected_products=(), selected_details=(), biz=None,
+                      search_all_business_types=False, previous: ColumnPlan | None = None) -> ColumnPlan:
+    """
+    previous = plan ของ export ครั้งก่อน (เช่น ใน session เดียวกัน): รายการที่ไม่เปลี่ยน (คำถามเดิม/จำนวนเดิม,
+    สินค้าเดิมกับ detail ชุดเดิม) ยกคอลัมน์มาทั้งช่วง ไม่ต้อง generate_unique_label / หา group ซ้ำ
+    ถ้ามีชื่อคอลัมน์ชนกัน (ต้องต่อท้าย #n) จะสร้างใหม่ทั้งหมด — ผลเหมือนไม่ส่ง previous เสมอ
+    """
+    reuse = previous.segments if previous is not None and not previous.collisions else {}
+    plan = _PlanBuilder(previous if reuse else None)
+    match_context = ("match", biz, bool(search_all_business_types))  # group ที่หาให้ ขึ้นกับคลังที่ใช้หา
+    generate_unique_label = LabelAllocator()
+
+    def add_segment(key, emit):
+        start, span = len(plan.labels), reuse.get(key)
+        if span is not None:
+            plan.copy_from(previous, *span)
+            generate_unique_label.reserve(previous.labels[span[0]:span[1]])
+        else:
+            emit()
+        plan.segments[key] = (start, len(plan.labels))
+
+    def add_question(group, item):
+        base_q, qty = item["question"], item["qty"]
+
+        def emit():
+            for i in range(1, qty + 1):
+                plan.add(group, generate_unique_label(base_q, i, qty), base_q, i)
+        add_segment(("question", item["given"], base_q, qty, group), emit)
+
+    # ✅ Group questions (ยังคง logic เดิม + fuzzy สำรองจากคลังเดียวกัน)
+    grouped_questions_by_group = {}
+    unmatched_questions = []
+
+    # ถ้า group ใส่มาแล้ว ใช้เลย; ถ้าไม่ ก็หา group จากคลังเดียวกันทีเดียวทั้ง batch (ที่เคยหาแล้วใน previous ใช้ผลเดิม)
+    known_groups = {key[2]: key[4] for key in reuse if key[0] == "question" and key[1] == match_context}
+    items = []
+    for q in selected_questions:
+        given = q.get("Group") if q.get("Group") not in [None, "", NO_GROUP] else match_context
+        items.append({"question": q["Question"], "qty": q["Quantity"], "given": given})
+    need_match = [item["question"] for item in items
+                  if item["given"] == match_context and item["question"] not in known_groups]
+    if need_match and biz is not None:
+        matched_groups = iter(get_q_group_matcher(biz, search_all_business_types).match_many(need_match))
+    else:
+        matched_groups = iter([NO_GROUP] * len(need_match))
+
+    for item in items:
+        if item["given"] != match_context:
+            group = item["given"]
+        elif item["question"] in known_groups:
+            group = known_groups[item["question"]]
+        else:
+            group = next(matched_groups)
+        if group == NO_GROUP:
+            unmatched_questions.append(item)
+        else:
+            grouped_questions_by_group.setdefault(group, []).append(item)
+
+    already_handled = set()
+    for group in PREFERRED_QGROUP_ORDER:
+        if group in grouped_questions_by_group:
+            already_handled.add(group)
+            for item in grouped_questions_by_group[group]:
+                add_question(group, item)
+
+    for group in grouped_questions_by_group:
+        if group not in already_handled and group != NO_GROUP:
+            for item in grouped_questions_by_group[group]:
+                add_question(group, item)
+
+    for item in unmatched_questions:
+        add_question(NO_GROUP, item)
+
+    # Cross product
+    if selected_products and selected_details:
+        details = tuple(selected_details)
+        for prod in selected_products:
+            def emit(prod=prod):
+                for i in range(1, prod["qty"] + 1):
+                    for detail in details:
+                        base_q = f"{prod['name']}-{detail}"
+                        plan.add("Product & Details", generate_unique_label(base_q, i, prod["qty"]), base_q, i,
+                                 product=prod["name"], detail=detail)
+            add_segment(("product", prod["name"], prod["qty"], details), emit)
+
+    if reuse and generate_unique_label.collisions:
+        return build_column_plan(selected_questions, selected_products, selected_details, biz=biz,
+                                 search_all_business_types=search_all_business_types)
+    return plan.build(generate_unique_label.collisions)
+
+
+def estimate_column_count(selected_questions, selected_products=(), selected_details=()) -> int:
+    """จำนวนคอลัมน์ที่จะได้ (คำนวณก่อน build plan — ใช้เตือนใน UI)"""
+    n = sum(int(q["Quantity"]) for q in selected_questions)
+    if selected_products and selected_details:
+        n += sum(int(p["qty"]) for p in selected_products) * len(selected_details)
+    return n
+
+
+def selection_fingerprint(biz, selected_questions, selected_products=(), selected_details=(),
+                          search_all_business_types=False, bank_version: str = BANK_VERSION) -> str:
+    """hash ของ selection ทั้งหมด (รวมคำถาม/สินค้าที่เพิ่มเอง และเวอร์ชันคลัง) — selection เดียวกันได้ไฟล์เดียวกัน"""
+    payload = json.dumps(
+        [biz, list(selected_questions), list(selected_products), list(selected_details),
+         bool(search_all_business_types), bank_version, ARTIFACT_FORMAT, DATA_END_ROW],
+        ensure_ascii=False, sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def config_fingerprint(config: SurveyConfig) -> str:
+    return selection_fingerprint(config.business_type, config.questions, config.products, config.details,
+                                 config.search_all_business_types)
+
+
+def plan_from_config(config: SurveyConfig) -> ColumnPlan:
+    return build_column_plan(
+        config.questions, config.products, config.details,
+        biz=config.business_type, search_all_business_types=config.search_all_business_types,
+    )
+
+
+# =========================
+#   PREVIEW (ใช้ในหน้า UI)
+# =========================
+def template_frame(plan: ColumnPlan) -> pd.DataFrame:
+    """DataFrame สำหรับ Excel แนวนอน (หัว 2 แถว + Blank rows)"""
+    header_df = pd.DataFrame([plan.groups(), plan.labels])
+    empty = pd.DataFrame([[""] * len(plan) for _ in range(5)])
+    return pd.concat([header_df, empty], ignore_index=True)
+
+
+def vertical_frame(plan: ColumnPlan) -> pd.DataFrame:
+    """Excel แนวตั้ง (แบบ PDF) + ลำดับ"""
+    df_vertical = pd.DataFrame({"Group": plan.groups(), "Question": plan.labels, "Answer": ""})
+    df_vertical.index += 1  # ให้เริ่มจาก 1
+    df_vertical.reset_index(inplace=True)
+    df_vertical.rename(columns={"index": "No."}, inplace=True)
+    return df_vertical
+
+
+# =========================
+#   WRITERS (openpyxl write-only: สตรีมทีละแถว ไม่สร้าง DataFrame/เซลล์ค้างในหน่วยความจำ)
+#   openpyxl import ในฟังก์ชัน — หน้าเลือกคำถามไม่ต้องโหลด (ช่วย cold start) จนกว่าจะสร้างไฟล์จริง
+# =========================
+def _save_workbook(wb) -> bytes:
+    buffer = BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+# รองรับ openpyxl หลายเวอร์ชัน
+def add_named_range(wb, name: str, ref: str):
+    from openpyxl.workbook.defined_name import DefinedName
+    obj = DefinedName(name=name, attr_text=ref)  # workbook-scope
+    dn = wb.defined_names
+    if hasattr(dn, "add"):
+        dn.add(obj)
+    elif hasattr(dn, "append"):
+        dn.append(obj)
+    else:
+        dn[name] = obj
+
+
+def write_dict_sheet(wb, title: str = "Dict") -> dict:
+    """
+    ชีต Dict (หัว = หมวด, ใต้หัว = รายการ) + Named Range ต่อหมวด (LIST_GREY, LIST_MORTAR, ...)
+    คืน map หมวด -> ชื่อ named range
+    """
+    from openpyxl.utils import get_column_letter
+    dict_ws = wb.create_sheet(title)
+    dict_ws.sheet_state = "visible"
+    dict_ws.append(list(DICT_DATA.keys()))
+    for row in zip_longest(*DICT_DATA.values()):
+        dict_ws.append(row)
+
+    range_name_map = {}
+    for ci, cat in enumerate(DICT_DATA.keys(), start=1):
+        items = DICT_DATA[cat]
+        if not items:  # ข้ามกลุ่มที่ไม่มีรายการ
+            continue
+        col_letter = get_column_letter(ci)
+        end_row = len(items) + 1  # ข้อมูลเริ่มที่แถว 2 → แถวสุดท้าย = 1 + len
+        nm = f"LIST_{cat}"        # เช่น LIST_GREY
+        # ใส่ quote ชื่อชีต กันชื่อแปลก/มีเว้นวรรค
+        add_named_range(wb, nm, f"'{title}'!${col_letter}$2:${col_letter}${end_row}")
+        range_name_map[cat] = nm
+    return range_name_map
+
+
+def category_runs(categories) -> dict:
+    """รหัสหมวด -> ช่วงตำแหน่งที่ติดกัน [(first, last), ...] (ข้าม NO_CODE) — ใช้ทำ sqref หลายช่วงใน DV เดียว"""
+    runs = {}
+    for code in np.unique(categories[categories != NO_CODE]).tolist():
+        idx = np.flatnonzero(categories == code)
+        breaks = np.flatnonzero(np.diff(idx) != 1) + 1
+        firsts = idx[np.r_[0, breaks]].tolist()
+        lasts = idx[np.r_[breaks - 1, len(idx) - 1]].tolist()
+        runs[CATEGORIES[code]] = list(zip(firsts, lasts))
+    return runs
+
+
+def list_validation(range_name: str, sqref: str):
+    from openpyxl.worksheet.datavalidation import DataValidation
+    # ✅ In-cell dropdown ติ้กไว้ + allow blank + ไม่เด้ง error
+    dv = DataValidation(type="list", formula1=f"={range_name}", allow_blank=True)  # เช่น =LIST_GREY
+    dv.showDropDown = False
+    dv.showErrorMessage = False
+    dv.sqref = sqref
+    return dv
+
+
+def brand_validations(plan: ColumnPlan, range_name_map: dict, start: int = 0, stop: int | None = None,
+                      data_end_row: int = DATA_END_ROW):
+    """
+    DV ของคอลัมน์ยี่ห้อ/รุ่น/แบรนด์ "หนึ่งอันต่อหมวด" — คอลัมน์หมวดเดียวกันรวมเป็น sqref หลายช่วง (เช่น "B4:D100 H4:H100")
+    ใช้หมวดที่ plan คำนวณไว้แล้ว; ขนาดไฟล์ไม่โตตามจำนวนแถว (data_end_row) หรือจำนวนคอลัมน์ที่ติดกัน
+    """
+    from openpyxl.utils import get_column_letter
+    for group, runs in category_runs(plan.categories[start:stop]).items():
+        if group not in range_name_map:
+            continue
+        sqref = " ".join(
+            f"{get_column_letter(first + 1)}{DATA_START_ROW}:{get_column_letter(last + 1)}{data_end_row}"
+            for first, last in runs
+        )
+        yield list_validation(range_name_map[group], sqref)
+
+
+def column_shards(n_columns: int, max_columns: int = EXCEL_MAX_COLUMNS):
+    """แบ่งคอลัมน์เป็นช่วง [start, stop) ไม่เกิน max_columns ต่อชีต (ไม่มีคอลัมน์ก็ยังได้ 1 ชีต)"""
+    return [(start, min(start + max_columns, n_columns)) for start in range(0, n_columns, max_columns)] or [(0, 0)]
+
+
+def shard_title(base: str, index: int) -> str:
+    return base if index == 0 else f"{base} ({index + 1})"
+
+
+def write_shard_manifest(wb, base_title: str, shards, labels):
+    """ชีต Manifest บอกว่าคอลัมน์ที่เท่าไหร่ของ plan อยู่ชีตไหน (เขียนเฉพาะตอนถูกแบ่งชีต)"""
+    ws = wb.create_sheet("Manifest")
+    ws.append(["sheet", "first_column", "last_column", "column_count", "first_label", "last_label"])
+    for index, (start, stop) in enumerate(shards):
+        ws.append([shard_title(base_title, index), start + 1, stop, stop - start, labels[start], labels[stop - 1]])
+
+
+def build_template_excel(plan: ColumnPlan, max_columns: int = EXCEL_MAX_COLUMNS,
+                         data_end_row: int = DATA_END_ROW) -> bytes:
+    """
+    Excel แนวนอน + ชีต Dict + dropdown ให้คอลัมน์ยี่ห้อ/รุ่น/แบรนด์ ของกลุ่ม Product & Details
+    เกิน max_columns จะแบ่งเป็น "Survey Template", "Survey Template (2)", ... + ชีต Manifest
+    """
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    shards = column_shards(len(plan), max_columns)
+    sheets = [wb.create_sheet(shard_title("Survey Template", i)) for i in range(len(shards))]
+    range_name_map = write_dict_sheet(wb)
+
+    for ws, (start, stop) in zip(sheets, shards):
+        # หัว 3 แถว (เลขคอลัมน์, q_group, คำถาม) — layout เดียวกับ final_df.to_excel เดิม (แถวว่างไม่ต้องเขียน)
+        ws.append(range(start, stop))
+        ws.append(plan.groups(start, stop))
+        ws.append(plan.labels[start:stop])
+        for dv in brand_validations(plan, range_name_map, start, stop, data_end_row):
+            ws.data_validations.append(dv)
+
+    if len(shards) > 1:
+        write_shard_manifest(wb, "Survey Template", shards, plan.labels)
+    return _save_workbook(wb)
+
+
+def resolve_pdf_font(font_path: str = FONT_PATH):
+    """ฟอนต์ไทย (เช็คไฟล์ก่อนเพื่อกันพังตอนรันบนเครื่องที่ไม่มีฟอนต์) -> (font_name, font_size)"""
+    return register_font(font_path)
+
+
+def build_pdf(plan: ColumnPlan, font_path: str = FONT_PATH, workers: int = 1) -> bytes:
+    return render_pdf(plan.rows(), font_path, workers=workers)
+
+
+def build_vertical_excel(plan: ColumnPlan) -> bytes:
+    """Excel แนวตั้ง (แบบ PDF) + ลำดับ"""
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Survey Vertical")
+    ws.append(["No.", "Group", "Question", "Answer"])
+    for no, (group, label) in enumerate(zip(plan.groups(), plan.labels), start=1):
+        ws.append([no, group, label, None])
+    return _save_workbook(wb)
+
+
+def build_google_sheets_excel(plan: ColumnPlan, max_columns: int = EXCEL_MAX_COLUMNS) -> bytes:
+    """
+    Excel สำหรับ Google Sheets (หัว 1 แถว, สะอาด, import ได้ทันที)
+    เกิน max_columns จะแบ่ง Responses เป็นหลายชีต + ชีต Manifest
+    """
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+
+    # Sheet 1: Responses (ให้กรอกจริงใน Google Sheets) — ใช้เฉพาะคอลัมน์ที่เลือกไว้แล้วใน 'columns'
+    shards = column_shards(len(plan), max_columns)
+    for index, (start, stop) in enumerate(shards):
+        ws = wb.create_sheet(shard_title("Responses", index))
+        ws.freeze_panes = "A2"  # freeze หัวตาราง
+        ws.append(plan.labels[start:stop])
+
+    # Sheet 2: DataDictionary (อธิบายคอลัมน์ไว้ เผื่อใช้ใน AppSheet/ภายหลัง)
+    dict_ws = wb.create_sheet("DataDictionary")
+    dict_ws.append(["column_name", "q_group", "question_text"])
+    for label, group in zip(plan.labels, plan.groups()):
+        dict_ws.append([label, group, label])
+
+    if len(shards) > 1:
+        write_shard_manifest(wb, "Responses", shards, plan.labels)
+    return _save_workbook(wb)
+
+
+def build_long_excel(plan: ColumnPlan) -> bytes:
+    """
+    Layout แบบ long (respondent, q_group, question, answer) — หนึ่งคำถามต่อแถว ไม่ติดเพดานคอลัมน์
+    เขียนบล็อกของผู้ตอบคนที่ 1 ไว้ให้ คนถัดไปคัดลอกบล็อกแล้วเปลี่ยนเลข respondent
+    """
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Responses")
+    ws.freeze_panes = "A2"
+    range_name_map = write_dict_sheet(wb)
+
+    ws.append(["respondent", "q_group", "question", "answer"])
+    for group, label in zip(plan.groups(), plan.labels):
+        ws.append([1, group, label, None])
+
+    # dropdown ในช่อง answer ของแถวยี่ห้อ — หนึ่ง DV ต่อหมวด (แถวติดกันรวมเป็นช่วง)
+    for cat, runs in category_runs(plan.categories).items():
+        if cat in range_name_map:
+            sqref = " ".join(f"D{first + 2}:D{last + 2}" if last > first else f"D{first + 2}" for first, last in runs)
+            ws.data_validations.append(list_validation(range_name_map[cat], sqref))
+    return _save_workbook(wb)
+
+
+BUILDERS = {
+    "excel": build_template_excel,
+    "pdf": build_pdf,
+    "vertical": build_vertical_excel,
+    "google_sheets": build_google_sheets_excel,
+    "long": build_long_excel,
+}
+
+
+class LazyArtifacts:
+    """
+    artifact ของ plan หนึ่งชุด: สร้างเมื่อถูกขอครั้งแรก (เช่น ตอนกดปุ่มดาวน์โหลด) แล้วจำไว้
+    thread-safe — st.download_button เรียก callable จาก thread อื่น
+    ส่ง cache (ArtifactCache) มาด้วย: หาในดิสก์ก่อนตาม fingerprint แล้วค่อยสร้าง
+
+    ไม่ถือ bytes ของไฟล์ค้างไว้ทั้ง session: ไฟล์ที่อยู่ใน cache จำแค่ว่าอยู่ (อ่านจากดิสก์ตอนดาวน์โหลด),
+    ที่เหลือพักใน SpooledTemporaryFile (เกิน SPOOL_MAX_BYTES ย้ายลงดิสก์) — ลบเมื่อ close() หรือ session หายไป
+    """
+
+    def __init__(self, plan: ColumnPlan, fingerprint: str = "", cache=None):
+        self.plan = plan
+        self.fingerprint = fingerprint
+        self.cache = cache if fingerprint else None
+        self._data = {}  # kind -> SpooledTemporaryFile หรือ None (= อยู่ใน cache บนดิสก์)
+        self._locks = {kind: threading.Lock() for kind in BUILDERS}
+        self._finalizer = weakref.finalize(self, _close_spools, self._data)
+
+    def _store(self, kind: str, data: bytes):
+        """เก็บผลที่สร้างแล้ว: ลง cache ได้ก็จำแค่ว่าอยู่ใน cache ไม่งั้นพักใน spool (เรียกตอนถือ lock ของ kind)"""
+        if self.cache is not None and self.cache.put(self.fingerprint, kind, data):
+            self._data[kind] = None
+            return
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, prefix=f"survey_{kind}_")
+        spool.write(data)
+        self._data[kind] = spool
+
+    def _read(self, kind: str) -> bytes | None:
+        """อ่านผลที่จำไว้ (สำเนาเดียว ส่งต่อให้ดาวน์โหลดได้เลย) หรือ None ถ้ายังไม่มี/ถูก evict จาก cache ไปแล้ว"""
+        if kind not in self._data:
+            return None
+        spool = self._data[kind]
+        if spool is None:
+            return self.cache.get(self.fingerprint, kind)
+        spool.seek(0)
+        return spool.read()
+
+    def get(self, kind: str) -> bytes:
+        with self._locks[kind]:
+            data = self._read(kind)
+            if data is None and kind not in self._data and self.cache is not None:
+                data = self.cache.get(self.fingerprint, kind)
+                if data is not None:
+                    self._data[kind] = None
+            if data is None:
+                data = BUILDERS[kind](self.plan)
+                self._store(kind, data)
+            return data
+
+    def put(self, kind: str, data: bytes):
+        """ผลที่สร้างจากที่อื่น (เช่น worker ของ export_jobs) — เขียนลง cache หรือพักใน spool"""
+        with self._locks[kind]:
+            _close_spools({kind: self._data.pop(kind, None)})
+            self._store(kind, data)
+
+    def load_cached(self, kind: str) -> bool:
+        """มีใน cache บนดิสก์ไหม (ไม่สร้างใหม่ ไม่อ่านเข้าหน่วยความจำ) -> True ถ้าพร้อมใช้แล้ว"""
+        with self._locks[kind]:
+            if kind not in self._data and self.cache is not None and self.cache.contains(self.fingerprint, kind):
+                self._data[kind] = None
+            return kind in self._data
+
+    def loader(self, kind: str):
+        """callable ไม่มี argument สำหรับ data= ของ st.download_button"""
+        return partial(self.get, kind)
+
+    def bundle(self, kinds=DEFAULT_ARTIFACTS, executor=None) -> bytes:
+        """zip ของไฟล์ที่ขอ — ไฟล์ที่ยังไม่มีสร้างพร้อมกันใน executor (ดู build_bundle)"""
+        return build_bundle(self.plan, kinds, executor, artifacts=self)
+
+    def is_built(self, kind: str) -> bool:
+        return kind in self._data
+
+    def close(self):
+        """ลบไฟล์ชั่วคราวทั้งหมด (ขอใหม่หลังจากนี้ได้ — อ่านจาก cache หรือสร้างใหม่)"""
+        for kind, lock in self._locks.items():
+            with lock:
+                _close_spools({kind: self._data.pop(kind, None)})
+
+
+def _close_spools(data: dict):
+    for spool in data.values():
+        if spool is not None:
+            spool.close()
+
+
+def write_bundle(files) -> bytes:
+    """(kind, bytes) ทีละไฟล์ -> zip (ชื่อไฟล์ตาม ARTIFACTS); เขียนผ่าน spool ไม่ต้องถือทุกไฟล์พร้อมกัน"""
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, prefix="survey_bundle_") as spool:
+        with zipfile.ZipFile(spool, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for kind, data in files:
+                zf.writestr(ARTIFACTS[kind][0], data)
+        spool.seek(0)
+        return spool.read()
+
+
+def build_bundle(plan: ColumnPlan, kinds=DEFAULT_ARTIFACTS, executor=None,
+                 artifacts: LazyArtifacts | None = None) -> bytes:
+    """
+    สร้างทุกไฟล์พร้อมกันจาก plan เดียว แล้วรวมเป็น zip — เวลารวม ≈ ไฟล์ที่ช้าที่สุด (มักเป็น PDF) ไม่ใช่ผลรวม
+    executor: pool ที่มีอยู่แล้ว (ไม่ส่ง = ProcessPoolExecutor ชั่วคราวหนึ่ง process ต่อไฟล์; CPU เดียวสร้างเองทีละไฟล์)
+    artifacts: ไฟล์ที่มีแล้ว (ในหน่วยความจำ/cache) ใช้เลย ที่ขาดสร้างใน executor แล้วเก็บกลับเข้า artifacts
+    """
+    unknown = set(kinds) - set(BUILDERS)
+    if unknown:
+        raise ValueError(f"unknown artifact(s): {', '.join(sorted(unknown))}")
+    if artifacts is None:
+        artifacts = LazyArtifacts(plan)
+    missing = [kind for kind in kinds if not artifacts.load_cached(kind)]
+    if len(missing) > 1 and executor is None and (os.cpu_count() or 1) > 1:
+        with ProcessPoolExecutor(max_workers=min(len(missing), os.cpu_count())) as pool:
+            return build_bundle(plan, kinds, pool, artifacts)
+    if missing and executor is not None:
+        futures = [(kind, executor.submit(BUILDERS[kind], plan)) for kind in missing]
+        for kind, future in futures:
+            artifacts.put(kind, future.result())
+    return write_bundle((kind, artifacts.get(kind)) for kind in kinds)
+
+
+def build_artifacts(plan: ColumnPlan, kinds=DEFAULT_ARTIFACTS) -> dict:
+    """สร้าง artifact ตามชื่อที่ขอ -> {kind: bytes}"""
+    unknown = set(kinds) - set(BUILDERS)
+    if unknown:
+        raise ValueError(f"unknown artifact(s): {', '.join(sorted(unknown))}")
+    return {kind: BUILDERS[kind](plan) for kind in kinds}
@@ -0,0 +1,326 @@
+# 📥 INGEST — อ่านไฟล์แบบสอบถามที่กรอกแล้ว (survey_template.xlsx / survey_google_sheets.xlsx) ลง Parquet
+# หนึ่งแถวต่อหนึ่งคำตอบ (long): ไฟล์, ผู้ตอบ, คอลัมน์, q_group, label -> product / detail / instance, value
+#
+# ใช้งาน:
+#   python survey_ingest.py returned/*.xlsx --store survey_store/ --workers 8
+# รันซ้ำได้: ไฟล์ที่ไม่เปลี่ยน (ขนาด + mtime หรือ sha1 เท่าเดิม) จะถูกข้าม, ไฟล์ที่เปลี่ยนจะเขียน part ใหม่ทับของเดิม
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from question_bank import BUSINESS_TYPES, get_sheets_data
+
+PRODUCT_GROUP = "Product & Details"
+TEMPLATE_SHEET = "Survey Template"
+RESPONSES_SHEET = "Responses"
+STATE_FILE = "_ingested.json"
+ANSWERS_DIR = "answers"
+ANSWER_COLUMNS = ["source_file", "sheet", "respondent", "column_index", "q_group", "label",
+                  "base_question", "product", "detail", "instance", "value"]
+
+
+class IngestError(ValueError):
+    """ไฟล์ไม่ตรงโครงที่ export ไป (หัวตาราง / DataDictionary ไม่ตรงกัน)"""
+
+
+# =========================
+#   LABEL -> product / detail / instance
+# =========================
+def _known_details() -> list:
+    details = set()
+    for biz in BUSINESS_TYPES:
+        sheets_data = get_sheets_data(biz)
+        if "Product & Details" in sheets_data:
+            details.update(sheets_data["Product & Details"]["standard_question_th"])
+    return sorted(details, key=len, reverse=True)
+
+
+_SUFFIX = r"(?:#(?P<instance>\d+))?(?:#(?P<dup>\d+))?$"
+# ลอง detail ที่รู้จักจากคลังก่อน (detail มีขีดได้) ไม่เจอค่อยตัดที่ขีดสุดท้าย (detail ที่พิมพ์เพิ่มเอง)
+_KNOWN_DETAIL_RE = re.compile(
+    r"^(?P<product>.+)-(?P<detail>" + "|".join(re.escape(d) for d in _known_details()) + ")" + _SUFFIX
+)
+_ANY_DETAIL_RE = re.compile(r"^(?P<product>.+)-(?P<detail>[^-#]+)" + _SUFFIX)
+_QUESTION_RE = re.compile(r"^(?P<base>.*?)" + _SUFFIX)
+
+
+def parse_labels(labels, groups) -> pd.DataFrame:
+    """
+    แยก label กลับเป็น base_question / product / detail / instance (ทำทีละ label ที่ไม่ซ้ำ แบบ vectorized)
+    label มาจาก generate_unique_label: "<product>-<detail>" (+ "#i" เมื่อ qty > 1, + "#n" เมื่อชื่อชน)
+    คอลัมน์นอก Product & Details: product/detail = <NA>, base_question = label ที่ตัด "#i" ออก
+    """
+    frame = pd.DataFrame({"label": pd.Series(labels, dtype="string"), "q_group": pd.Series(groups, dtype="string")})
+    unique = frame.drop_duplicates()
+    is_product = (unique["q_group"] == PRODUCT_GROUP).to_numpy()
+
+    question = unique["label"].str.extract(_QUESTION_RE)
+    product = unique["label"].str.extract(_KNOWN_DETAIL_RE)
+    fallback = unique["label"].str.extract(_ANY_DETAIL_RE)
+    product = product.where(product["product"].notna(), fallback)
+
+    parsed = pd.DataFrame({
+        "label": unique["label"],
+        "q_group": unique["q_group"],
+        "base_question": question["base"],
+        "product": product["product"].where(is_product),
+        "detail": product["detail"].where(is_product),
+        "instance": question["instance"].fillna("1").astype("Int16"),
+    })
+    has_product = parsed["product"].notna()
+    parsed.loc[has_product, "base_question"] = parsed["product"] + "-" + parsed["detail"]
+    return frame.merge(parsed, on=["label", "q_group"], how="left")
+
+
+# =========================
+#   READ ONE WORKBOOK
+# =========================
+def _trim(row) -> list:
+    row = list(row)
+    while row and row[-1] in (None, ""):
+        row.pop()
+    return row
+
+
+def _data_rows(rows):
+    """แถวคำตอบ (ข้ามแถวว่างทั้งแถว) -> (respondent เริ่ม 1, values)"""
+    respondent = 0
+    for values in rows:
+        if any(v not in (None, "") for v in values):
+            respondent += 1
+            yield respondent, values
+
+
+def _read_template(wb, sheet_names):
+    """survey_template.xlsx: แถว 1 = ลำดับคอลัมน์ของ plan, แถว 2 = q_group, แถว 3 = คำถาม, แถว 4+ = คำตอบ"""
+    header_index, header_group, header_label, cells = [], [], [], []
+    for name in sheet_names:
+        rows = wb[name].iter_rows(values_only=True)
+        try:
+            numbers, groups, labels = _trim(next(rows)), list(next(rows)), list(next(rows))
+        except StopIteration:
+            raise IngestError(f"{name}: หัวตารางไม่ครบ 3 แถว")
+        expected = list(range(len(header_index), len(header_index) + len(numbers)))
+        if numbers != expected:
+            raise IngestError(f"{name}: ลำดับคอลัมน์แถวแรกไม่ต่อเนื่อง (คาดว่าเริ่มที่ {len(header_index)})")
+        groups, labels = groups[:len(numbers)], labels[:len(numbers)]
+        if any(g in (None, "") for g in groups) or any(q in (None, "") for q in labels):
+            raise IngestError(f"{name}: แถว q_group / คำถาม มีช่องว่าง")
+        offset = len(header_index)
+        for respondent, values in _data_rows(rows):
+            for ci, value in enumerate(values[:len(numbers)]):
+                if value not in (None, ""):
+                    cells.append((name, respondent, offset + ci, value))
+        header_index += numbers
+        header_group += [str(g) for g in groups]
+        header_label += [str(q) for q in labels]
+    return header_group, header_label, cells
+
+
+def _read_google_sheets(wb, sheet_names):
+    """survey_google_sheets.xlsx: Responses หัว 1 แถว, q_group มาจากชีต DataDictionary (ต้องตรงกันทุกคอลัมน์)"""
+    if "DataDictionary" not in wb.sheetnames:
+        raise IngestError("ไม่มีชีต DataDictionary")
+    dictionary = [r for r in wb["DataDictionary"].iter_rows(min_row=2, values_only=True) if r and r[0] not in (None, "")]
+    dict_labels = [str(r[0]) for r in dictionary]
+    dict_groups = [str(r[1]) for r in dictionary]
+
+    header_label, cells = [], []
+    for name in sheet_names:
+        rows = wb[name].iter_rows(values_only=True)
+        header = _trim(next(rows, ()))
+        offset = len(header_label)
+        for respondent, values in _data_rows(rows):
+            for ci, value in enumerate(values[:len(header)]):
+                if value not in (None, ""):
+                    cells.append((name, respondent, offset + ci, value))
+        header_label += [str(h) for h in header]
+
+    if header_label != dict_labels:
+        mismatch = next((i for i, (a, b) in enumerate(zip(header_label, dict_labels)) if a != b),
+                        min(len(header_label), len(dict_labels)))
+        raise IngestError(f"หัวคอลัมน์ Responses ไม่ตรงกับ DataDictionary ที่คอลัมน์ {mismatch + 1} "
+                          f"({len(header_label)} vs {len(dict_labels)} คอลัมน์)")
+    return dict_groups, header_label, cells
+
+
+def _shard_names(sheetnames, base):
+    pattern = re.compile(rf"^{re.escape(base)}(?: \((\d+)\))?$")
+    found = [(int(m.group(1) or 1), name) for name in sheetnames if (m := pattern.match(name))]
+    return [name for _, name in sorted(found)]
+
+
+def source_key(path: str, root: str | None = None) -> str:
+    """
+    ชื่อไฟล์ต้นทางที่เก็บใน source_file = path เทียบกับ root (ค่าเริ่มต้น = โฟลเดอร์ที่รัน)
+    ทุกทีมส่งกลับมาเป็น survey_template.xlsx — ใช้แค่ชื่อไฟล์จะรวมคนละไฟล์เป็นไฟล์เดียว; อยู่นอก root ใช้ path เต็ม
+    """
+    path = os.path.abspath(path)
+    rel = os.path.relpath(path, os.path.abspath(root or os.getcwd()))
+    return path if rel == os.pardir or rel.startswith(os.pardir + os.sep) else rel.replace(os.sep, "/")
+
+
+def read_workbook(path: str, source: str | None = None) -> pd.DataFrame:
+    """
+    อ่านไฟล์ที่กรอกแล้ว 1 ไฟล์ (openpyxl read-only, สตรีมทีละแถว) -> DataFrame ตาม ANSWER_COLUMNS
+    source = ค่าในคอลัมน์ source_file (ไม่ใส่ = source_key(path))
+    """
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        if template_sheets := _shard_names(wb.sheetnames, TEMPLATE_SHEET):
+            groups, labels, cells = _read_template(wb, template_sheets)
+        elif response_sheets := _shard_names(wb.sheetnames, RESPONSES_SHEET):
+            groups, labels, cells = _read_google_sheets(wb, response_sheets)
+        else:
+            raise IngestError(f"ไม่พบชีต '{TEMPLATE_SHEET}' หรือ '{RESPONSES_SHEET}'")
+    finally:
+        wb.close()
+
+    if len(set(labels)) != len(labels):
+        raise IngestError("มีชื่อคอลัมน์ซ้ำ — ไม่ใช่ไฟล์ที่ export จากระบบ")
+    columns = parse_labels(labels, groups)
+    sheet, respondent, column_index, value = zip(*cells) if cells else ((), (), (), ())
+    index = pd.Index(column_index, dtype="int64")
+    answers = pd.DataFrame({
+        "source_file": source or source_key(path),
+        "sheet": pd.Categorical(sheet),
+        "respondent": pd.array(respondent, dtype="int32"),
+        "column_index": pd.array(column_index, dtype="int32"),
+    })
+    for col in ("q_group", "label", "base_question", "product", "detail"):
+        answers[col] = pd.Categorical(columns[col].to_numpy()[index]) if len(index) else pd.Categorical([])
+    answers["instance"] = columns["instance"].to_numpy()[index] if len(index) else pd.array([], dtype="Int16")
+    answers["value"] = pd.array([str(v) for v in value], dtype="string")
+    return answers[ANSWER_COLUMNS]
+
+
+# =========================
+#   STORE (Parquet หนึ่ง part ต่อไฟล์ต้นทาง)
+# =========================
+def file_sha1(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def part_path(store: str, source: str) -> str:
+    key = hashlib.sha1(os.path.abspath(source).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(store, ANSWERS_DIR, f"part-{key}.parquet")
+
+
+def load_state(store: str) -> dict:
+    try:
+        with open(os.path.join(store, STATE_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(store: str, state: dict):
+    path = os.path.join(store, STATE_FILE)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def is_unchanged(path: str, entry: dict | None) -> bool:
+    """ขนาด + mtime เท่าเดิม = ไม่เปลี่ยน; ถ้า mtime เปลี่ยนแต่ sha1 เท่าเดิม (เช่น copy มาใหม่) ก็ถือว่าไม่เปลี่ยน"""
+    if not entry:
+        return False
+    st = os.stat(path)
+    if st.st_size != entry.get("size"):
+        return False
+    if st.st_mtime_ns == entry.get("mtime_ns"):
+        return True
+    return file_sha1(path) == entry.get("sha1")
+
+
+def ingest_file(path: str, store: str, root: str | None = None) -> dict:
+    """อ่านไฟล์ 1 ไฟล์แล้วเขียน part ของตัวเอง (รันใน worker process) -> state entry"""
+    started = time.perf_counter()
+    st = os.stat(path)
+    sha1 = file_sha1(path)
+    source = source_key(path, root)
+    answers = read_workbook(path, source)
+    target = part_path(store, path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp = f"{target}.tmp"
+    answers.to_parquet(tmp, index=False)
+    os.replace(tmp, target)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha1": sha1, "part": os.path.relpath(target, store),
+            "source_file": source,
+            "rows": len(answers), "respondents": int(answers["respondent"].max()) if len(answers) else 0,
+            "seconds": round(time.perf_counter() - started, 3)}
+
+
+def load_answers(store: str, columns=None) -> pd.DataFrame:
+    """อ่านคำตอบทั้งหมดใน store (ทุก part) กลับเป็น DataFrame"""
+    directory = os.path.join(store, ANSWERS_DIR)
+    if not os.path.isdir(directory) or not any(n.endswith(".parquet") for n in os.listdir(directory)):
+        return pd.DataFrame(columns=columns or ANSWER_COLUMNS)
+    return pd.read_parquet(directory, columns=columns)
+
+
+def ingest(paths, store: str, workers: int = 1, force: bool = False, log=print, root: str | None = None) -> dict:
+    """
+    ingest หลายไฟล์แบบขนาน (ข้ามไฟล์ที่ไม่เปลี่ยน) -> {"ingested", "skipped", "failed"}
+    root = โฟลเดอร์ที่ source_file เทียบ path ด้วย (ค่าเริ่มต้น = โฟลเดอร์ที่รัน)
+    """
+    os.makedirs(store, exist_ok=True)
+    state = load_state(store)
+    todo, skipped = [], 0
+    for path in dict.fromkeys(os.path.abspath(p) for p in paths):
+        entry = state.get(path)
+        unchanged = entry is not None and entry.get("source_file") == source_key(path, root)
+        if not force and unchanged and is_unchanged(path, entry):
+            skipped += 1
+        else:
+            todo.append(path)
+
+    ingested = failed = 0
+    with ProcessPoolExecutor(max_workers=max(1, min(workers, len(todo) or 1))) as pool:
+        futures = {pool.submit(ingest_file, path, store, root): path for path in todo}
+        for fut in as_completed(futures):
+            path = futures[fut]
+            try:
+                state[path] = fut.result()
+                ingested += 1
+                log(f"✅ {state[path]['source_file']}: {state[path]['respondents']} respondents, "
+                    f"{state[path]['rows']} answers in {state[path]['seconds']}s")
+            except Exception as e:
+                failed += 1
+                log(f"❌ {source_key(path, root)}: {type(e).__name__}: {e}")
+    save_state(store, state)
+    return {"ingested": ingested, "skipped": skipped, "failed": failed}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="อ่านไฟล์แบบสอบถามที่กรอกแล้วลง Parquet store")
+    parser.add_argument("files", nargs="+", help="ไฟล์ .xlsx (survey_template / survey_google_sheets)")
+    parser.add_argument("-s", "--store", default="survey_store", help="โฟลเดอร์ Parquet store")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="จำนวน process")
+    parser.add_argument("--force", action="store_true", help="อ่านใหม่ทุกไฟล์ แม้ไม่เปลี่ยน")
+    parser.add_argument("--root", default=None,
+                        help="source_file เก็บเป็น path เทียบกับโฟลเดอร์นี้ (ค่าเริ่มต้น = โฟลเดอร์ที่รัน)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    res = ingest(args.files, args.store, args.workers, args.force, root=args.root)
+    print(f"🏁 {res['ingested']} ingested, {res['skipped']} unchanged, {res['failed']} failed "
+          f"in {time.perf_counter() - started:.1f}s -> {args.store}")
+    return 1 if res["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+# 🖨️ PDF RENDERER — วาดตาราง Group / Question / Answer ทีละหน้าลง canvas โดยตรง
+# (เดิมใช้ platypus Table ก้อนเดียว ซึ่ง split ทีละหน้าแบบ O(n²) และ register ฟอนต์ใหม่ทุกครั้งที่กด)
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+
+from reportlab.lib.pagesizes import A4, landscape  # เบา — ส่วนที่วาดจริง (canvas, ฟอนต์) import ตอนสร้าง PDF
+
+FONT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "font", "THSarabun.ttf")
+
+# layout เดียวกับ SimpleDocTemplate + Table เดิม
+PAGE_SIZE = landscape(A4)
+MARGIN = 72                        # ขอบกระดาษของ SimpleDocTemplate
+FRAME_PADDING = 6                  # padding ของ Frame
+HEADER = ("Group", "Question", "Answer")
+COL_WIDTHS = (120, 280, 320)
+HEADER_HEIGHT = 25
+ROW_HEIGHT = 60
+CELL_PADDING = 6                   # ซ้าย/ขวา
+CELL_TOP_PADDING = 3
+MAX_LINES = 3                      # บรรทัดที่ใส่ได้ในแถวสูง 60pt (ที่ 14pt)
+
+
+@lru_cache(maxsize=None)
+def register_font(font_path: str = FONT_PATH):
+    """ฟอนต์ไทย register ครั้งเดียวต่อ process -> (font_name, font_size); ไม่มีไฟล์ใช้ Helvetica"""
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+    if os.path.exists(font_path):
+        pdfmetrics.registerFont(TTFont("THSarabun", font_path))
+        return "THSarabun", 14
+    return "Helvetica", 10
+
+
+@lru_cache(maxsize=65536)
+def text_width(text: str, font_name: str, font_size: float) -> float:
+    from reportlab.pdfbase import pdfmetrics
+    return pdfmetrics.stringWidth(text, font_name, font_size)
+
+
+@lru_cache(maxsize=65536)
+def fit_lines(text: str, width: float, font_name: str, font_size: float, max_lines: int = MAX_LINES):
+    """
+    ตัดข้อความให้อยู่ในความกว้างคอลัมน์ (ตัดที่ช่องว่างก่อน ถ้าคำยาวเกิน — เช่นภาษาไทยไม่มีเว้นวรรค — ตัดรายตัวอักษร)
+    ข้อความที่พอดีอยู่แล้วคืนค่าเดิม; label ซ้ำๆ ของ cross-product จึงคำนวณครั้งเดียว
+    """
+    if not text or text_width(text, font_name, font_size) <= width:
+        return (text,)
+    lines, line = [], ""
+    for word in text.split(" "):
+        candidate = f"{line} {word}" if line else word
+        if text_width(candidate, font_name, font_size) <= width:
+            line = candidate
+            continue
+        if line:
+            lines.append(line)
+        line = ""
+        for ch in word:
+            if line and text_width(line + ch, font_name, font_size) > width:
+                lines.append(line)
+                line = ch
+            else:
+                line += ch
+    if line:
+        lines.append(line)
+    if len(lines) > max_lines:
+        lines = lines[:max_lines]
+        lines[-1] = lines[-1][:-1] + "…"
+    return tuple(lines)
+
+
+def rows_per_page() -> int:
+    usable = PAGE_SIZE[1] - 2 * MARGIN - 2 * FRAME_PADDING - HEADER_HEIGHT
+    return max(1, int(usable // ROW_HEIGHT))
+
+
+def _draw_page(c, rows, font_name, font_size):
+    from reportlab.lib import colors
+    page_w, page_h = PAGE_SIZE
+    table_w = sum(COL_WIDTHS)
+    frame_w = page_w - 2 * MARGIN - 2 * FRAME_PADDING
+    x0 = MARGIN + FRAME_PADDING + (frame_w - table_w) / 2  # ตารางจัดกลาง (เหมือน hAlign CENTER)
+    top = page_h - MARGIN - FRAME_PADDING
+    leading = font_size * 1.2
+    col_x = [x0]
+    for w in COL_WIDTHS:
+        col_x.append(col_x[-1] + w)
+
+    # หัวตาราง
+    c.setFillColor(colors.grey)
+    c.rect(x0, top - HEADER_HEIGHT, table_w, HEADER_HEIGHT, stroke=0, fill=1)
+    c.setFillColor(colors.whitesmoke)
+    c.setFont(font_name, font_size, leading)
+    for x, text in zip(col_x, HEADER):
+        c.drawString(x + CELL_PADDING, top - CELL_TOP_PADDING - font_size, text)
+
+    # เนื้อหา
+    c.setFillColor(colors.black)
+    y = top - HEADER_HEIGHT
+    for row in rows:
+        for x, w, value in zip(col_x, COL_WIDTHS, row):
+            ty = y - CELL_TOP_PADDING - font_size
+            for line in fit_lines(str(value), w - 2 * CELL_PADDING, font_name, font_size):
+                c.drawString(x + CELL_PADDING, ty, line)
+                ty -= leading
+        y -= ROW_HEIGHT
+
+    # เส้นตาราง
+    c.setStrokeColor(colors.black)
+    c.setLineWidth(1)
+    c.grid(col_x, [top, top - HEADER_HEIGHT] + [top - HEADER_HEIGHT - ROW_HEIGHT * (i + 1) for i in range(len(rows))])
+
+
+def render_pages(rows, font_path: str = FONT_PATH) -> bytes:
+    """วาดทีละหน้า (rows_per_page แถวต่อหน้า) — หน่วยความจำไม่โตตามขนาด Table"""
+    from reportlab.pdfgen import canvas
+
+    font_name, font_size = register_font(font_path)
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=PAGE_SIZE)
+    per_page = rows_per_page()
+    for start in range(0, max(len(rows), 1), per_page):
+        _draw_page(c, rows[start:start + per_page], font_name, font_size)
+        c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+def render_pdf(rows, font_path: str = FONT_PATH, workers: int = 1, min_rows_per_worker: int = 2000) -> bytes:
+    """
+    PDF ตาราง Group / Question / Answer
+    workers > 1: แบ่งช่วงหน้าให้ process อื่นวาดแล้วรวมไฟล์ (ต้องมี pypdf; ไม่มีก็วาดเองทีเดียว)
+    """
+    rows = [list(r) for r in rows]
+    n_chunks = min(workers, len(rows) // min_rows_per_worker) if workers > 1 else 1
+    if n_chunks <= 1:
+        return render_pages(rows, font_path)
+    try:
+        from pypdf import PdfWriter
+    except ImportError:
+        return render_pages(rows, font_path)
+
+    # ช่วงต้องลงตัวตามหน้า เพื่อให้รวมแล้วได้หน้าเหมือนวาดทีเดียว
+    per_page = rows_per_page()
+    pages = -(-len(rows) // per_page)
+    pages_per_chunk = -(-pages // n_chunks)
+    step = pages_per_chunk * per_page
+    chunks = [rows[i:i + step] for i in range(0, len(rows), step)]
+    with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+        parts = list(pool.map(render_pages, chunks, [font_path] * len(chunks)))
+
+    writer = PdfWriter()
+    for part in parts:
+        writer.append(BytesIO(part))
+    out = BytesIO()
+    writer.write(out)
+    return out.getvalue()
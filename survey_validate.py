@@ -0,0 +1,85 @@
+# 🔎 VALIDATE — ตรวจคำตอบช่องยี่ห้อกับรายการใน Dict (DICT_DATA)
+# dropdown ใน Excel ตั้ง showErrorMessage = False จึงพิมพ์อะไรก็ได้ — ตรวจทีหลังทีละทั้งคอลัมน์ (vectorized)
+#
+# ใช้งาน:
+#   python survey_validate.py --store survey_store/ -o violations.csv
+import argparse
+import sys
+
+import pandas as pd
+
+from question_bank import DICT_DATA
+from survey_engine import dropdown_category
+from survey_ingest import load_answers
+
+REPORT_COLUMNS = ["source_file", "label", "category", "answers", "invalid", "invalid_rate", "top_invalid"]
+
+
+def label_categories(labels) -> pd.Series:
+    """หมวด dropdown ของแต่ละ label (คำนวณครั้งเดียวต่อ label ที่ไม่ซ้ำ)"""
+    labels = pd.Series(labels)
+    unique = labels.drop_duplicates()
+    mapping = dict(zip(unique, (dropdown_category(str(label)) for label in unique)))
+    return labels.map(mapping).astype("category")
+
+
+def check_answers(answers: pd.DataFrame, dict_data=DICT_DATA) -> pd.DataFrame:
+    """
+    เฉพาะคำตอบในคอลัมน์ที่มี dropdown -> DataFrame เดิม + category, valid
+    ตรวจทีละหมวด: value.isin(รายการของหมวด) ทั้งคอลัมน์ในครั้งเดียว
+    (ตัดช่องว่างหัวท้ายทั้งคำตอบและรายการ — บางรายการใน Dict มีช่องว่างนำหน้า)
+    """
+    categories = label_categories(answers["label"])
+    has_dropdown = categories.notna().to_numpy()
+    checked = answers.loc[has_dropdown].copy()
+    checked["category"] = categories[has_dropdown].cat.remove_unused_categories().to_numpy()
+    values = checked["value"].astype("string").str.strip()
+
+    valid = pd.Series(False, index=checked.index)
+    for cat, items in dict_data.items():
+        in_cat = (checked["category"] == cat).to_numpy()
+        if in_cat.any():
+            valid[in_cat] = values[in_cat].isin(frozenset(str(item).strip() for item in items)).to_numpy()
+    checked["valid"] = valid
+    return checked
+
+
+def violation_report(answers: pd.DataFrame, dict_data=DICT_DATA, top: int = 5) -> pd.DataFrame:
+    """รายงานต่อไฟล์ต่อคอลัมน์: จำนวนคำตอบ, จำนวนที่ไม่อยู่ในรายการ, ค่าที่ผิดบ่อยสุด top ค่า"""
+    checked = check_answers(answers, dict_data)
+    if checked.empty:
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+    keys = ["source_file", "label", "category"]
+    checked["invalid"] = ~checked["valid"]
+    report = checked.groupby(keys, observed=True, sort=True).agg(answers=("valid", "size"),
+                                                                  invalid=("invalid", "sum"))
+    report["invalid_rate"] = (report["invalid"] / report["answers"]).round(4)
+
+    bad = checked.loc[checked["invalid"], keys + ["value"]]
+    counts = bad.value_counts(sort=True).reset_index(name="n")
+    counts = counts.groupby(keys, observed=True, sort=False).head(top)
+    top_invalid = counts.groupby(keys, observed=True, sort=False)["value"].agg(" | ".join)
+    report["top_invalid"] = top_invalid.reindex(report.index).fillna("")
+    return report.reset_index()[REPORT_COLUMNS]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="ตรวจคำตอบช่องยี่ห้อกับรายการใน Dict")
+    parser.add_argument("-s", "--store", default="survey_store", help="Parquet store จาก survey_ingest.py")
+    parser.add_argument("-o", "--out", default=None, help="เขียนรายงานเป็น .csv (ไม่ใส่ = พิมพ์สรุป)")
+    args = parser.parse_args(argv)
+
+    answers = load_answers(args.store, columns=["source_file", "respondent", "label", "value"])
+    report = violation_report(answers)
+    if args.out:
+        report.to_csv(args.out, index=False, encoding="utf-8-sig")
+    flagged = report[report["invalid"] > 0]
+    print(f"🔎 {int(report['answers'].sum())} brand answers in {report['source_file'].nunique()} files, "
+          f"{int(report['invalid'].sum())} not in Dict ({len(flagged)} columns)")
+    if not args.out and not flagged.empty:
+        print(flagged.to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())